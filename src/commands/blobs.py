@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+
+from loguru import logger
+
+from src.core.clients import create_blob_store
+from src.db import close_db, connect_db
+from src.repos import create_data_repo
+
+
+async def offload(batch_size: int) -> int:
+    """
+    Moves the page bodies still kept in `data` rows into the configured blob store.
+
+    Usage:
+        DATA_BLOB_STORE=local python -m src.commands.blobs offload
+    """
+    await connect_db()
+    try:
+        return await create_data_repo().offload_bodies(batch_size)
+    finally:
+        await close_db()
+
+
+async def collect_garbage(min_age_s: float, dry_run: bool) -> int:
+    """
+    Deletes blobs no `data` row references any more. Blobs written less than
+    `min_age_s` ago are kept, since their row may not be committed yet. Candidates are
+    listed before the references are read, and each one's age is checked again right
+    before it is deleted: a row committed during the scan stored or re-put its blob
+    after the listing, which makes the blob young again.
+
+    Usage:
+        python -m src.commands.blobs gc --min-age 3600 --dry-run
+
+    Returns:
+        int: Number of blobs deleted, or that would be with `dry_run`.
+    """
+    blob_store = create_blob_store()
+    if blob_store is None:
+        raise ValueError("No blob store configured")
+    await connect_db()
+    try:
+        candidates = [key async for key in blob_store.keys(min_age_s)]
+        referenced: set[str] = set()
+        async for keys in create_data_repo().iter_blob_keys():
+            referenced.update(keys)
+        deleted = 0
+        for key in candidates:
+            if key in referenced:
+                continue
+            if dry_run or await blob_store.delete(key, min_age_s):
+                deleted += 1
+        return deleted
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the page body blob store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    offload_parser = subparsers.add_parser("offload")
+    offload_parser.add_argument("--batch-size", type=int, default=500)
+    gc_parser = subparsers.add_parser("gc")
+    gc_parser.add_argument("--min-age", type=float, default=3600.0, help="Seconds a blob is kept unreferenced")
+    gc_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "offload":
+        total = asyncio.run(offload(args.batch_size))
+        logger.info(f"offload(): Moved {total} bodies to the blob store")
+    else:
+        total = asyncio.run(collect_garbage(args.min_age, args.dry_run))
+        logger.info(f"collect_garbage(): {'Would delete' if args.dry_run else 'Deleted'} {total} blobs")
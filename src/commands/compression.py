@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import zstandard
+from loguru import logger
+
+from src.commands.extract import _load_corpus
+from src.core.compression import train_dictionary
+from src.core.formats import CanonicalUrl
+from src.db import close_db, connect_db
+from src.repos import create_data_repo
+
+
+async def train(base_url: str, samples: int, size: int, recompress: bool) -> int:
+    """
+    Trains a zstd dictionary from the stored pages of one site and makes it the one new
+    pages of that host are compressed with.
+
+    Usage:
+        python -m src.commands.compression train https://example.com --recompress
+
+    Returns:
+        int: Id of the new dictionary.
+    """
+    await connect_db()
+    try:
+        data_repo = create_data_repo()
+        pages = await data_repo.sample_html(base_url, samples)
+        if not pages:
+            raise ValueError(f"No stored pages for {base_url}")
+        dictionary = train_dictionary(pages, size)
+        host = CanonicalUrl.parse(base_url).host
+        obj = await data_repo.add_dictionary(host, dictionary.as_bytes(), samples=len(pages))
+        logger.info(f"train(): Trained {obj} from {len(pages)} pages")
+        if recompress:
+            total = await data_repo.recompress(base_url)
+            logger.info(f"train(): Recompressed {total} rows of {base_url}")
+        return obj.dict_id
+    finally:
+        await close_db()
+
+
+def _measure(compress: Any, decompress: Any, pages: list[bytes]) -> dict[str, Any]:
+    started_at = time.perf_counter()
+    frames = [compress(page) for page in pages]
+    compress_s = time.perf_counter() - started_at
+    started_at = time.perf_counter()
+    for frame in frames:
+        decompress(frame)
+    decompress_s = time.perf_counter() - started_at
+    size = sum(len(page) for page in pages)
+    return {
+        "bytes": sum(len(frame) for frame in frames),
+        "ratio": round(size / sum(len(frame) for frame in frames), 2),
+        "compress_mb_s": round(size / compress_s / 1024 / 1024, 1),
+        "decompress_mb_s": round(size / decompress_s / 1024 / 1024, 1),
+    }
+
+
+def benchmark(
+    path: Path, limit: int | None = None, levels: list[int] | None = None, size: int = 112_640
+) -> dict[str, Any]:
+    """
+    Compression ratio and speed over a corpus, plain and with a dictionary trained on
+    half the pages and measured on the other half.
+
+    Usage:
+        python -m src.commands.compression bench ./corpus
+    """
+    corpus = [html for _, html in _load_corpus(path, limit)]
+    train_pages, test_pages = corpus[::2], [html.encode("utf-8") for html in corpus[1::2]]
+    dictionary = train_dictionary(train_pages, size)
+    results: dict[str, Any] = {"pages": len(test_pages), "html_bytes": sum(len(page) for page in test_pages)}
+    for level in levels or [3, 9]:
+        plain = zstandard.ZstdCompressor(level=level)
+        with_dict = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+        results[f"zstd-{level}"] = _measure(plain.compress, zstandard.ZstdDecompressor().decompress, test_pages)
+        results[f"zstd-{level}-dict"] = _measure(
+            with_dict.compress, zstandard.ZstdDecompressor(dict_data=dictionary).decompress, test_pages
+        )
+        logger.info(f"benchmark(): level {level} {results[f'zstd-{level}']} {results[f'zstd-{level}-dict']}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train compression dictionaries and benchmark page compression")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    train_parser = subparsers.add_parser("train")
+    train_parser.add_argument("base_url", help="Site whose stored pages are sampled, e.g. https://example.com")
+    train_parser.add_argument("--samples", type=int, default=1000)
+    train_parser.add_argument("--size", type=int, default=112_640, help="Dictionary size in bytes")
+    train_parser.add_argument("--recompress", action="store_true", help="Rewrite the site's stored bodies")
+    bench_parser = subparsers.add_parser("bench")
+    bench_parser.add_argument("path", type=Path, help="Html file or directory of *.html pages")
+    bench_parser.add_argument("--limit", type=int, default=None)
+    bench_parser.add_argument("--level", type=int, action="append", dest="levels")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        asyncio.run(train(args.base_url, args.samples, args.size, args.recompress))
+    else:
+        print(json.dumps(benchmark(args.path, args.limit, args.levels), indent=2))
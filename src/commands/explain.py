@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import sys
+from typing import Any
+
+from loguru import logger
+from tortoise.queryset import QuerySet
+
+from src.core.config import settings
+from src.core.types import ModelType, State
+from src.db import close_db, connect_db
+from src.db.models import Task
+from src.repos import TaskRepo
+
+# Below this many rows the optimizer may rightly prefer a table scan, so plans are
+# reported but not enforced
+_MIN_ROWS = 1000
+
+
+def _frontier_queries(task_repo: TaskRepo, batch_size: int) -> dict[str, tuple[QuerySet, str]]:
+    """
+    The queries `TaskRepo.claim_next` runs for the standalone worker, with the index each
+    has to use. Crawl runs filter on their own `job_id` instead of NULL, with the same plan.
+    """
+    by_state = task_repo.frontier_query(ModelType.URL, State.NEW, job_id=None)
+    expired = task_repo.expired_query(ModelType.URL, settings.crawl_url_expiration, job_id=None)
+    return {
+        "claim_by_state": (by_state.limit(batch_size).select_for_update(skip_locked=True), "idx_task_type_b9bf66"),
+        "claim_expired": (expired.limit(batch_size).select_for_update(skip_locked=True), "idx_task_type_a22c04"),
+    }
+
+
+def _problems(plan: list[dict[str, Any]], index: str) -> list[str]:
+    problems = []
+    for row in plan:
+        extra = row.get("Extra") or ""
+        if row.get("type") in ("ALL", "index"):
+            problems.append(f"full {'table' if row['type'] == 'ALL' else 'index'} scan")
+        if row.get("key") != index:
+            problems.append(f"uses index {row.get('key')} instead of {index}")
+        if "filesort" in extra or "temporary" in extra:
+            problems.append(extra)
+    return problems
+
+
+async def check(batch_size: int, strict: bool) -> bool:
+    """
+    EXPLAINs the frontier queries and checks that each one is an ordered read of its
+    index: no table scan and no filesort. Meant to run against a database with a real
+    frontier, e.g. after a migration or a change to `TaskRepo`.
+
+    Usage:
+        python -m src.commands.explain --strict
+
+    Returns:
+        bool: Whether every plan passed.
+    """
+    await connect_db()
+    try:
+        task_repo = TaskRepo()
+        connection = Task._meta.db
+        if connection.capabilities.dialect != "mysql":
+            raise ValueError(f"EXPLAIN checks need MySQL or MariaDB, not {connection.capabilities.dialect}")
+        rows = await task_repo.estimate_count(Task.all())
+        enforce = strict or rows >= _MIN_ROWS
+        if not enforce:
+            logger.warning(f"check(): Only ~{rows} tasks, plans are not enforced without --strict")
+
+        passed = True
+        for name, (query, index) in _frontier_queries(task_repo, batch_size).items():
+            _, plan = await connection.execute_query(f"EXPLAIN {query.sql(params_inline=True)}")
+            problems = _problems(plan, index)
+            if problems:
+                logger.error(f"check(): {name} -> {'; '.join(problems)} | {plan}")
+                passed = passed and not enforce
+            else:
+                logger.info(f"check(): {name} -> {plan[0]['type']} on {index}, ~{plan[0]['rows']} rows")
+        return passed
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that frontier queries stay index range scans")
+    parser.add_argument("--batch-size", type=int, default=settings.crawl_claim_batch_size)
+    parser.add_argument("--strict", action="store_true", help=f"Enforce plans on tables under {_MIN_ROWS} rows")
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(check(args.batch_size, args.strict)) else 1)
@@ -0,0 +1,136 @@
+import argparse
+import json
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from pydantic import HttpUrl
+
+from src.core.common import html_to_json
+from src.core.extract import extract_html, extract_page
+from src.core.types import Extractor
+
+_URL = HttpUrl("https://example.com/")
+
+HtmlExtractor = Callable[[HttpUrl, str], dict[str, Any]]
+
+
+def _load_corpus(path: Path, limit: int | None) -> Iterator[tuple[str, str]]:
+    """Yields (name, html) for every *.html file under `path`."""
+    files = sorted(path.rglob("*.html")) if path.is_dir() else [path]
+    for file in files[:limit]:
+        yield str(file), file.read_text(encoding="utf-8", errors="replace")
+
+
+def _comparable(content: dict[str, Any]) -> dict[str, Any]:
+    return {**content, "meta": {**content["meta"], "processed_at": None}}
+
+
+def check_parity(path: Path, limit: int | None = None) -> int:
+    """
+    Compares `extract_html` against `html_to_json` on every page of the corpus.
+
+    Usage:
+        python -m src.commands.extract parity ./corpus
+
+    Returns:
+        int: Number of pages whose output differs.
+    """
+    pages = mismatches = 0
+    for name, html in _load_corpus(path, limit):
+        pages += 1
+        expected = _comparable(html_to_json(_URL, html))
+        actual = _comparable(extract_html(_URL, html))
+        if actual != expected:
+            mismatches += 1
+            fields = [key for key in expected if expected[key] != actual.get(key)]
+            logger.warning(f"check_parity(): {name} differs in {fields}")
+    logger.info(f"check_parity(): {pages - mismatches}/{pages} pages identical")
+    return mismatches
+
+
+def _throughput(extractor: HtmlExtractor, corpus: list[tuple[str, str]], repeat: int) -> tuple[float, float]:
+    size = sum(len(html.encode("utf-8")) for _, html in corpus) * repeat
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in corpus:
+            extractor(_URL, html)
+    elapsed = time.perf_counter() - started_at
+    return len(corpus) * repeat / elapsed, size / elapsed / 1024 / 1024
+
+
+def benchmark(path: Path, limit: int | None = None, repeat: int = 3) -> dict[str, Any]:
+    """
+    Measures pages/s and MB/s of both extractors over the same corpus.
+
+    Usage:
+        python -m src.commands.extract bench ./corpus --repeat 5
+    """
+    corpus = list(_load_corpus(path, limit))
+    results: dict[str, Any] = {"pages": len(corpus), "repeat": repeat}
+    for name, extractor in (("html_to_json", html_to_json), ("extract_html", extract_html)):
+        pages_s, mb_s = _throughput(extractor, corpus, repeat)
+        results[name] = {"pages_s": round(pages_s, 1), "mb_s": round(mb_s, 2)}
+        logger.info(f"benchmark(): {name} {pages_s:.1f} pages/s {mb_s:.2f} MB/s")
+    results["speedup"] = round(results["extract_html"]["pages_s"] / results["html_to_json"]["pages_s"], 2)
+    return results
+
+
+def compare_backends(
+    path: Path,
+    limit: int | None = None,
+    repeat: int = 1,
+    extractors: list[Extractor] | None = None,
+) -> dict[str, Any]:
+    """
+    Speed and output size of each extractor backend over the same corpus.
+
+    Output size is the JSON-encoded content stored per page, and `ratio` is its share
+    of the html size.
+
+    Usage:
+        python -m src.commands.extract backends ./corpus
+    """
+    corpus = list(_load_corpus(path, limit))
+    html_size = sum(len(html.encode("utf-8")) for _, html in corpus)
+    results: dict[str, Any] = {"pages": len(corpus), "html_bytes": html_size, "repeat": repeat}
+    for extractor in extractors or list(Extractor):
+        started_at = time.perf_counter()
+        try:
+            for _ in range(repeat):
+                outputs = [extract_page(html, extractor)["content"] for _, html in corpus]
+        except ImportError as error:
+            logger.warning(f"compare_backends(): Skipped {extractor}: {error}")
+            continue
+        elapsed = time.perf_counter() - started_at
+
+        content_size = sum(len(json.dumps(content, ensure_ascii=False).encode("utf-8")) for content in outputs)
+        text_size = sum(len(content["full_text"]) for content in outputs)
+        results[extractor] = {
+            "pages_s": round(len(corpus) * repeat / elapsed, 1),
+            "mb_s": round(html_size * repeat / elapsed / 1024 / 1024, 2),
+            "content_bytes": content_size,
+            "full_text_chars": text_size,
+            "ratio": round(content_size / html_size, 3) if html_size else 0.0,
+        }
+        logger.info(f"compare_backends(): {extractor} {results[extractor]}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parity check and benchmark for html extractors")
+    parser.add_argument("command", choices=["parity", "bench", "backends"])
+    parser.add_argument("path", type=Path, help="Html file or directory of *.html pages")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--extractor", type=Extractor, action="append", dest="extractors")
+    args = parser.parse_args()
+
+    if args.command == "parity":
+        raise SystemExit(1 if check_parity(args.path, args.limit) else 0)
+    if args.command == "backends":
+        print(json.dumps(compare_backends(args.path, args.limit, args.repeat, args.extractors), indent=2))
+    else:
+        print(json.dumps(benchmark(args.path, args.limit, args.repeat), indent=2))
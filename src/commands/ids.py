@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from loguru import logger
+from tortoise import Tortoise
+
+from src.db import close_db, connect_db
+from src.db.db_fields import uuid7
+
+# Scratch tables shaped like `task`: a primary key, a unique key holding another id and a
+# secondary index, all of which carry the primary key
+_TABLE = """
+    CREATE TABLE `{table}` (
+        `id` {id_type} NOT NULL PRIMARY KEY,
+        `type` VARCHAR(32) NOT NULL,
+        `ref` {id_type} NOT NULL,
+        `state` VARCHAR(9),
+        `updated_at` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+        UNIQUE KEY `uid_type_ref` (`type`, `ref`),
+        KEY `idx_type_state_updated` (`type`, `state`, `updated_at`)
+    ) CHARACTER SET utf8mb4"""
+
+# Layout name -> (column type, id generator, encoding of an id for the column)
+_LAYOUTS: dict[str, tuple[str, Callable[[], uuid.UUID], Callable[[uuid.UUID], Any]]] = {
+    "char36_uuid4": ("CHAR(36)", uuid.uuid4, str),
+    "binary16_uuid7": ("BINARY(16)", uuid7, lambda value: value.bytes),
+}
+
+
+async def _bench_layout(connection: Any, name: str, rows: int, batch_size: int) -> dict[str, Any]:
+    id_type, generate, encode = _LAYOUTS[name]
+    table = f"_bench_ids_{name}"
+    await connection.execute_script(f"DROP TABLE IF EXISTS `{table}`")
+    await connection.execute_script(_TABLE.format(table=table, id_type=id_type))
+    try:
+        insert = f"INSERT INTO `{table}` (`id`, `type`, `ref`, `state`) VALUES (%s, %s, %s, %s)"
+        started_at = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            batch = [
+                [encode(generate()), "url", encode(generate()), "new"]
+                for _ in range(min(batch_size, rows - start))
+            ]
+            await connection.execute_many(insert, batch)
+        elapsed_s = time.perf_counter() - started_at
+
+        await connection.execute_script(f"ANALYZE TABLE `{table}`")
+        _, sizes = await connection.execute_query(
+            "SELECT `DATA_LENGTH` AS `data`, `INDEX_LENGTH` AS `index` FROM `information_schema`.`TABLES` "
+            "WHERE `TABLE_SCHEMA` = DATABASE() AND `TABLE_NAME` = %s",
+            [table],
+        )
+        result = {
+            "rows_s": round(rows / elapsed_s),
+            "seconds": round(elapsed_s, 2),
+            "data_mb": round(int(sizes[0]["data"]) / 1024 / 1024, 1),
+            "index_mb": round(int(sizes[0]["index"]) / 1024 / 1024, 1),
+        }
+        logger.info(f"benchmark(): {name} {result}")
+        return result
+    finally:
+        await connection.execute_script(f"DROP TABLE IF EXISTS `{table}`")
+
+
+async def benchmark(rows: int, batch_size: int) -> dict[str, Any]:
+    """
+    Insert throughput and on-disk size of random CHAR(36) uuid4 keys against time-ordered
+    BINARY(16) uuid7 keys. Each layout gets a scratch table in the configured database,
+    dropped afterwards. Sizes are InnoDB's estimates after ANALYZE TABLE.
+
+    Usage:
+        python -m src.commands.ids bench --rows 1000000
+    """
+    await connect_db()
+    try:
+        connection = Tortoise.get_connection("default")
+        if connection.capabilities.dialect != "mysql":
+            raise ValueError(f"The benchmark needs MySQL or MariaDB, not {connection.capabilities.dialect}")
+        return {"rows": rows, **{name: await _bench_layout(connection, name, rows, batch_size) for name in _LAYOUTS}}
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark primary key layouts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    bench_parser = subparsers.add_parser("bench")
+    bench_parser.add_argument("--rows", type=int, default=200_000)
+    bench_parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(benchmark(args.rows, args.batch_size)), indent=2))
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+
+from loguru import logger
+
+from src.core.clients import create_nlp_client
+from src.db import close_db, connect_db
+from src.repos import create_data_repo
+from src.services import create_nlp_service
+
+
+async def annotate(limit: int | None, follow_s: float | None) -> int:
+    """
+    Annotates the crawled pages that have no up-to-date NLP children.
+
+    With `follow_s` the job keeps running and looks for new or changed pages every
+    `follow_s` seconds after a run finds nothing left to do.
+
+    Usage:
+        python -m src.commands.nlp --follow 60
+
+    Returns:
+        int: Pages annotated.
+    """
+    await connect_db()
+    try:
+        nlp_service = create_nlp_service(create_data_repo(), create_nlp_client())
+        total = 0
+        while True:
+            stats = await nlp_service.annotate_pending(None if limit is None else limit - total)
+            total += stats.annotated
+            if follow_s is None or (limit is not None and total >= limit):
+                return total
+            if not stats.annotated:
+                await asyncio.sleep(follow_s)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Annotate crawled pages with spaCy")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many pages")
+    parser.add_argument("--follow", type=float, default=None, help="Keep polling every N seconds")
+    args = parser.parse_args()
+
+    total = asyncio.run(annotate(args.limit, args.follow))
+    logger.info(f"annotate(): Annotated {total} pages")
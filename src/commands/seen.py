@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+
+from loguru import logger
+
+from src.core.clients import CacheClient, SeenUrlFilter
+from src.core.config import settings
+from src.core.types import SeenMode
+from src.db import close_db, connect_db
+from src.repos import UrlRepo
+
+
+async def rebuild_seen_filter(mode: SeenMode, batch_size: int) -> int:
+    """
+    Warms the seen-url filter from every row of the `url` table.
+
+    Usage:
+        python -m src.commands.seen --mode bloom
+    """
+    await connect_db()
+    cache_client = CacheClient(cache_url=settings.cache_url)
+    try:
+        seen_url_filter = SeenUrlFilter(
+            cache=cache_client,
+            mode=mode,
+            capacity=settings.crawl_seen_capacity,
+            error_rate=settings.crawl_seen_error_rate,
+        )
+        return await seen_url_filter.rebuild(UrlRepo().iter_urls(batch_size))
+    finally:
+        await cache_client.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the seen-url filter from the url table")
+    parser.add_argument("--mode", type=SeenMode, default=settings.crawl_seen_filter or SeenMode.SET)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    total = asyncio.run(rebuild_seen_filter(args.mode, args.batch_size))
+    logger.info(f"rebuild_seen_filter(): Loaded {total} urls into the {args.mode} filter")
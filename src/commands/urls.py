@@ -0,0 +1,126 @@
+import argparse
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlparse, urlsplit, urlunsplit
+
+from loguru import logger
+from pydantic import HttpUrl, ValidationError
+
+import src.core.formats as formats
+from src.commands.extract import _load_corpus
+from src.core.extract import analyze_page
+from src.core.formats import clean_url, serialize
+
+Normalizer = Callable[[str], tuple[str, str]]
+
+
+def _legacy_normalize(url: str) -> tuple[str, str]:
+    """`clean_url` and `get_base_url` as they were before `CanonicalUrl`."""
+    url = "".join(ch for ch in url.strip() if ch.isprintable())
+    parsed = urlsplit(unquote(url))
+    clean = urlunsplit((parsed.scheme, parsed.netloc, parsed.path, parsed.query, parsed.fragment))
+    try:
+        http_url = HttpUrl(clean)
+    except ValidationError as e:
+        raise ValueError(f"Invalid URL after cleaning: {clean}") from e
+    parsed_url = urlparse(serialize(http_url))
+    base_url = HttpUrl.build(scheme=parsed_url.scheme, host=parsed_url.hostname, port=parsed_url.port, path="")
+    return serialize(http_url), serialize(base_url)
+
+
+def _normalize(url: str) -> tuple[str, str]:
+    canonical = clean_url(url)
+    return serialize(canonical), serialize(canonical.base_url)
+
+
+def _clear_caches() -> None:
+    formats._clean_url.cache_clear()
+    formats._parse_url.cache_clear()
+    formats._base_url.cache_clear()
+
+
+def _load_links(path: Path, limit: int | None) -> list[list[str]]:
+    """Outlinks of every page in the corpus, one list per page, as the crawler sees them."""
+    return [
+        analyze_page(f"https://example.com/{Path(name).name}", html).outlinks
+        for name, html in _load_corpus(path, limit)
+    ]
+
+
+def _try(normalize: Normalizer, url: str) -> tuple[str, str] | None:
+    try:
+        return normalize(url)
+    except ValueError:
+        return None
+
+
+def check_parity(path: Path, limit: int | None = None) -> int:
+    """
+    Compares the `CanonicalUrl` path against the pydantic round-trips it replaces.
+
+    Usage:
+        python -m src.commands.urls parity ./corpus
+
+    Returns:
+        int: Number of urls whose url or base url differs.
+    """
+    urls = {url for links in _load_links(path, limit) for url in links}
+    mismatches = 0
+    for url in urls:
+        expected, actual = _try(_legacy_normalize, url), _try(_normalize, url)
+        if actual != expected:
+            mismatches += 1
+            logger.warning(f"check_parity(): {url} -> {expected} != {actual}")
+    logger.info(f"check_parity(): {len(urls) - mismatches}/{len(urls)} urls identical")
+    return mismatches
+
+
+def _throughput(normalize: Normalizer, pages: list[list[str]], repeat: int) -> float:
+    _clear_caches()
+    total = sum(len(links) for links in pages) * repeat
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for links in pages:
+            for url in links:
+                _try(normalize, url)
+    return total / (time.perf_counter() - started_at)
+
+
+def benchmark(path: Path, limit: int | None = None, repeat: int = 3) -> dict[str, Any]:
+    """
+    Measures normalized links/s for the page outlinks of a corpus.
+
+    `first_pass` starts from empty caches, so it only benefits from links repeated
+    across pages; `repeat` passes model recrawls of the same pages.
+
+    Usage:
+        python -m src.commands.urls bench ./corpus --repeat 5
+    """
+    pages = _load_links(path, limit)
+    results: dict[str, Any] = {"pages": len(pages), "links": sum(len(links) for links in pages), "repeat": repeat}
+    for name, normalize in (("legacy", _legacy_normalize), ("canonical", _normalize)):
+        first_pass = _throughput(normalize, pages, 1)
+        repeated = _throughput(normalize, pages, repeat)
+        results[name] = {"first_pass_links_s": round(first_pass), "links_s": round(repeated)}
+        logger.info(f"benchmark(): {name} {first_pass:.0f} links/s first pass, {repeated:.0f} links/s repeated")
+    results["speedup"] = round(results["canonical"]["links_s"] / results["legacy"]["links_s"], 2)
+    results["first_pass_speedup"] = round(
+        results["canonical"]["first_pass_links_s"] / results["legacy"]["first_pass_links_s"], 2
+    )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parity check and benchmark for url normalization")
+    parser.add_argument("command", choices=["parity", "bench"])
+    parser.add_argument("path", type=Path, help="Html file or directory of *.html pages")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "parity":
+        raise SystemExit(1 if check_parity(args.path, args.limit) else 0)
+    print(json.dumps(benchmark(args.path, args.limit, args.repeat), indent=2))
@@ -1,5 +1,8 @@
+import base64
+import binascii
+import json
 import uuid
-from collections.abc import Iterable, Sequence
+from collections.abc import AsyncIterator, Iterable, Sequence
 from datetime import UTC, datetime
 from functools import cached_property
 from typing import Annotated, Any, Generic, TypeVar
@@ -9,6 +12,7 @@ from loguru import logger
 from pydantic import BaseModel, ConfigDict, Field
 from tortoise import fields, models, queryset
 from tortoise.exceptions import DoesNotExist
+from tortoise.expressions import Q
 
 # database - mode + repo
 _ModelT = TypeVar("_ModelT", bound=models.Model)
@@ -182,6 +186,132 @@ class BaseRepo(Generic[_ModelT]):
 
         return results, meta
 
+    def _keyset_field(self, sort: str) -> tuple[str, bool]:
+        key, descending = sort.removeprefix("-"), sort.startswith("-")
+        field = self._model._meta.fields_map.get(key)
+        if field is None or field.null or key not in self._model._meta.db_fields:
+            raise ValueError(f"Cannot paginate {self._model.__name__} by {key}: not a non-null column")
+        return key, descending
+
+    def _keyset_query(
+        self,
+        query: queryset.QuerySet[_ModelT],
+        key: str,
+        descending: bool,
+        after: tuple[Any, Any] | None,
+    ) -> queryset.QuerySet[_ModelT]:
+        """Rows strictly after `after` = (sort value, id) in (key, id) order."""
+        op = "lt" if descending else "gt"
+        if after is not None:
+            value, last_id = after
+            if key == "id":
+                query = query.filter(**{f"id__{op}": last_id})
+            else:
+                # The redundant `<=`/`>=` bound lets MySQL range-scan the index from the cursor
+                query = query.filter(
+                    Q(**{f"{key}__{op}e": value}),
+                    Q(**{f"{key}__{op}": value}) | Q(**{key: value, f"id__{op}": last_id}),
+                )
+        if key == "id":
+            return query.order_by("-id" if descending else "id")
+        return query.order_by(*((f"-{key}", "-id") if descending else (key, "id")))
+
+    def _encode_cursor(self, sort: str, row: Any) -> str:
+        key = sort.removeprefix("-")
+        values = row if isinstance(row, dict) else {key: getattr(row, key), "id": row.pk}
+        payload = jsonable_encoder({"s": sort, "v": values[key], "id": values["id"]})
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, sort: str, cursor: str) -> tuple[Any, Any]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if payload["s"] != sort:
+                raise ValueError(f"Cursor was issued for sort {payload['s']}")
+            fields_map = self._model._meta.fields_map
+            key = sort.removeprefix("-")
+            return fields_map[key].to_python_value(payload["v"]), fields_map["id"].to_python_value(payload["id"])
+        except (KeyError, TypeError, UnicodeDecodeError, binascii.Error, json.JSONDecodeError) as e:
+            raise ValueError("Invalid cursor") from e
+
+    async def estimate_count(self, query: queryset.QuerySet[_ModelT]) -> int:
+        """
+        Row count of `query` from the optimizer's estimate instead of a scan. On MySQL
+        this is the `rows` of EXPLAIN, which can be off by a wide margin; other
+        databases count exactly.
+        """
+        connection = self._model._meta.db
+        if connection.capabilities.dialect != "mysql":
+            return await query.count()
+        _, rows = await connection.execute_query(f"EXPLAIN {query.sql(params_inline=True)}")
+        return int(rows[0]["rows"] or 0) if rows else 0
+
+    async def paginate(
+        self,
+        *args: Any,
+        sort: str = "id",
+        cursor: str | None = None,
+        page_size: int = 10,
+        with_total: bool = False,
+        **kwargs: Any,
+    ) -> tuple[list[_ModelT], dict[str, Any]]:
+        """
+        Keyset pagination: each page continues from the last row of the previous one,
+        so deep pages cost the same as the first.
+
+        Parameters:
+            sort: One non-null column, `-` prefixed for descending; `id` breaks ties.
+            cursor: `next_cursor` of the previous page, None for the first page.
+            with_total: Adds an estimated `total` (see `estimate_count`).
+
+        Returns:
+            tuple[list[_ModelT], dict[str, Any]]: The rows and `next_cursor`, which is
+            None on the last page.
+
+        Raises:
+            ValueError: If `sort` is not a non-null column or `cursor` is not one of ours.
+        """
+        key, descending = self._keyset_field(sort)
+        after = self._decode_cursor(sort, cursor) if cursor else None
+        query: queryset.QuerySet[_ModelT] = self._model.filter(*args, **kwargs)
+
+        # One extra row tells whether there is a next page without counting
+        results: list[_ModelT] = await self._keyset_query(query, key, descending, after).limit(page_size + 1)
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        meta: dict[str, Any] = {
+            "page_size": page_size,
+            "next_cursor": self._encode_cursor(sort, results[-1]) if has_more else None,
+        }
+        if with_total:
+            meta["total"] = await self.estimate_count(query)
+        return results, meta
+
+    async def iter_batches(
+        self,
+        *args: Any,
+        sort: str = "id",
+        batch_size: int = 1000,
+        values: Sequence[str] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[list[Any]]:
+        """
+        Walks every matching row in keyset order, `batch_size` rows per query. With
+        `values`, rows are dicts of those columns instead of model instances.
+        """
+        key, descending = self._keyset_field(sort)
+        query: queryset.QuerySet[_ModelT] = self._model.filter(*args, **kwargs)
+        columns = list(dict.fromkeys([*values, key, "id"])) if values else None
+        after: tuple[Any, Any] | None = None
+        while True:
+            batch_query = self._keyset_query(query, key, descending, after).limit(batch_size)
+            rows: list[Any] = await (batch_query.values(*columns) if columns else batch_query)
+            if not rows:
+                return
+            yield rows
+            last = rows[-1]
+            after = (last[key], last["id"]) if columns else (getattr(last, key), last.pk)
+
     async def first(
         self,
         *args: Any,
@@ -225,21 +355,45 @@ class BaseRepo(Generic[_ModelT]):
     async def bulk_create(
         self,
         objects: Iterable[_ModelT | dict[str, Any]],
-        ignore_conflicts: bool = False
+        ignore_conflicts: bool = False,
+        batch_size: int | None = None,
     ) -> list[_ModelT]:
+        objects = list(objects)
+        if not objects:
+            return []
 
-        if isinstance(next(iter(objects)), dict):
-            model_instances = [self._model(**obj) for obj in objects]  # type: ignore
-        else:
-            model_instances = list(objects)
+        model_instances = [self._model(**obj) for obj in objects] if isinstance(objects[0], dict) else objects  # type: ignore
 
         await self._model.bulk_create(
             model_instances,
+            batch_size=batch_size,
             ignore_conflicts=ignore_conflicts
         )
 
         return model_instances
 
+    async def bulk_create_new(
+        self,
+        objects: Iterable[_ModelT | dict[str, Any]],
+        batch_size: int = 500,
+    ) -> list[uuid.UUID]:
+        """
+        Inserts objects with chunked multi-row `INSERT IGNORE` statements.
+
+        Primary keys are generated client side, so rows skipped because of a unique
+        conflict are detected by looking their ids up afterwards.
+
+        Returns:
+            list[uuid.UUID]: Ids of the rows that were actually created.
+        """
+        instances = await self.bulk_create(objects, ignore_conflicts=True, batch_size=batch_size)
+        ids = [instance.pk for instance in instances]
+
+        created_ids: list[uuid.UUID] = []
+        for start in range(0, len(ids), batch_size):
+            created_ids += await self.filter_existing_ids(ids[start:start + batch_size])
+        return created_ids
+
     async def update(self, instance: _ModelT, **kwargs: Any) -> _ModelT | None:
         for attr, value in kwargs.items():
             setattr(instance, attr, value)
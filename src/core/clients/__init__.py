@@ -1,9 +1,15 @@
 from collections.abc import AsyncGenerator
 
 from src.core.config import settings
+from src.core.types import BlobBackend
 
+from .blob import BlobStore, LocalBlobStore
 from .cache import CacheClient
-from .http import HttpClientFactory
+from .extraction import ExtractionCache
+from .http import HttpClientFactory, ResponseTooLargeError
+from .nlp import NlpClient
+from .parse import ParseExecutor
+from .seen import SeenUrlFilter
 from .soup import SoupClient
 
 
@@ -14,12 +20,85 @@ async def get_cache_client(
     )
 
 
+def create_seen_url_filter(cache_client: CacheClient) -> SeenUrlFilter | None:
+    if not settings.crawl_seen_filter:
+        return None
+    return SeenUrlFilter(
+        cache=cache_client,
+        mode=settings.crawl_seen_filter,
+        capacity=settings.crawl_seen_capacity,
+        error_rate=settings.crawl_seen_error_rate,
+    )
+
+
+async def get_seen_url_filter(
+) -> AsyncGenerator[SeenUrlFilter | None]:
+    yield create_seen_url_filter(
+        CacheClient(cache_url=settings.cache_url)
+    )
+
+
+def create_extraction_cache(cache_client: CacheClient) -> ExtractionCache | None:
+    if not settings.crawl_extract_cache:
+        return None
+    return ExtractionCache(
+        cache=cache_client,
+        capacity=settings.crawl_extract_cache_size,
+        ttl_s=settings.crawl_extract_cache_ttl,
+    )
+
+
+async def get_extraction_cache(
+) -> AsyncGenerator[ExtractionCache | None]:
+    yield create_extraction_cache(
+        CacheClient(cache_url=settings.cache_url)
+    )
+
+
+def create_blob_store() -> BlobStore | None:
+    if settings.data_blob_store == BlobBackend.LOCAL:
+        return LocalBlobStore(root=settings.data_blob_root)
+    return None
+
+
+async def get_blob_store(
+) -> AsyncGenerator[BlobStore | None]:
+    yield create_blob_store()
+
+
 async def get_http_client_factory(
 ) -> AsyncGenerator[HttpClientFactory]:
     yield HttpClientFactory(
     )
 
 
+def create_parse_executor() -> ParseExecutor:
+    return ParseExecutor(
+        workers=settings.crawl_parse_workers,
+        max_pending=settings.crawl_parse_max_pending,
+    )
+
+
+async def get_parse_executor(
+) -> AsyncGenerator[ParseExecutor]:
+    yield create_parse_executor()
+
+
+def create_nlp_client() -> NlpClient:
+    return NlpClient(
+        model=settings.nlp_model,
+        batch_size=settings.nlp_batch_size,
+        n_process=settings.nlp_n_process,
+        exclude=settings.nlp_exclude,
+        max_chars=settings.nlp_max_chars,
+    )
+
+
+async def get_nlp_client(
+) -> AsyncGenerator[NlpClient]:
+    yield create_nlp_client()
+
+
 async def get_soup_client(
 ) -> AsyncGenerator[SoupClient]:
     yield SoupClient(
@@ -0,0 +1,141 @@
+import asyncio
+import mmap
+import os
+import re
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator
+from functools import cached_property
+from pathlib import Path
+
+from loguru import logger
+
+# Keys are hex digests, which also keeps them from escaping the store root
+_KEY = re.compile(r"[0-9a-f]{16,128}")
+_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore(ABC):
+    """
+    Storage for immutable bodies addressed by the checksum of their content.
+
+    Writing a key that already exists only marks it as written now, so a body shared by
+    many rows is stored once and its latest reference restarts the garbage collection
+    grace period. Subclasses implement the backend; this class only defines the interface.
+    """
+
+    @cached_property
+    def _tag(self) -> str:
+        return self.__class__.__name__
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether a blob is stored under `key`."""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes | AsyncIterable[bytes], replace: bool = False) -> int:
+        """
+        Stores `data` under `key` unless the key already exists, in which case the blob
+        is only marked as written now. `replace` overwrites it, for re-encoding a blob
+        without changing what it decodes to.
+
+        Returns:
+            int: Size of the stored blob in bytes.
+        """
+
+    @abstractmethod
+    def stream(self, key: str, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Raises:
+            FileNotFoundError: If there is no blob for `key`.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str, min_age_s: float = 0.0) -> bool:
+        """
+        Deletes the blob unless it was written less than `min_age_s` ago.
+
+        Returns:
+            bool: True if the blob was deleted.
+        """
+
+    @abstractmethod
+    def keys(self, min_age_s: float = 0.0) -> AsyncIterator[str]:
+        """Every stored key last written at least `min_age_s` ago."""
+
+    async def get(self, key: str) -> bytes:
+        return b"".join([chunk async for chunk in self.stream(key)])
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Blob store on a local or mounted filesystem.
+
+    A blob lives at `root/ab/cd/abcd...`, so no directory grows past 65536 entries.
+    Writes go to a temporary file next to the target and are renamed into place, so
+    readers never see a partial blob and concurrent writers of the same key are
+    harmless. Reads map the file instead of copying it through read() calls.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        self._root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        if not _KEY.fullmatch(key):
+            raise ValueError(f"Invalid blob key: {key}")
+        return self._root / key[:2] / key[2:4] / key
+
+    async def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    async def put(self, key: str, data: bytes | AsyncIterable[bytes], replace: bool = False) -> int:
+        path = self._path(key)
+        if not replace:
+            try:
+                os.utime(path)
+                return path.stat().st_size
+            except FileNotFoundError:
+                pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            with tmp_path.open("wb") as file:
+                if isinstance(data, bytes):
+                    await asyncio.to_thread(file.write, data)
+                else:
+                    async for chunk in data:
+                        await asyncio.to_thread(file.write, chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        size = path.stat().st_size
+        logger.debug(f"{self._tag}|put(): Stored {key} ({size} bytes)")
+        return size
+
+    async def stream(self, key: str, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+        with self._path(key).open("rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            # Empty files cannot be mapped
+            if not size:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, size, chunk_size):
+                    yield mapped[offset:offset + chunk_size]
+
+    async def delete(self, key: str, min_age_s: float = 0.0) -> bool:
+        path = self._path(key)
+        try:
+            if min_age_s and path.stat().st_mtime > time.time() - min_age_s:
+                return False
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def keys(self, min_age_s: float = 0.0) -> AsyncIterator[str]:
+        written_before = time.time() - min_age_s
+        for path in self._root.glob("??/??/*"):
+            if _KEY.fullmatch(path.name) and path.stat().st_mtime <= written_before:
+                yield path.name
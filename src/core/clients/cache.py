@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from functools import cached_property
 from typing import Annotated, Any
 
@@ -46,5 +47,76 @@ class CacheClient(metaclass=SingletonMeta):
     async def expire(self, key: str, ttl: int) -> None:
         await self._cache.expire(key, ttl)
 
+    async def hset(self, key: str, mapping: dict[str, str], ttl: int | None = None) -> None:
+        pipeline = self._cache.pipeline(transaction=True)
+        pipeline.hset(key, mapping=mapping)
+        if ttl:
+            pipeline.expire(key, ttl)
+        await pipeline.execute()
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        return await self._cache.hgetall(key)
+
+    async def hincrby(self, key: str, counters: dict[str, int]) -> None:
+        pipeline = self._cache.pipeline(transaction=True)
+        for field, amount in counters.items():
+            pipeline.hincrby(key, field, amount)
+        await pipeline.execute()
+
+    async def rename(self, key: str, new_key: str) -> None:
+        await self._cache.rename(key, new_key)
+
+    async def sadd(self, key: str, *values: str) -> int:
+        return await self._cache.sadd(key, *values)
+
+    async def smismember(self, key: str, values: list[str]) -> list[bool]:
+        return [bool(member) for member in await self._cache.smismember(key, values)]
+
+    async def setbits(self, key: str, offsets: Iterable[int]) -> None:
+        pipeline = self._cache.pipeline(transaction=False)
+        for offset in offsets:
+            pipeline.setbit(key, offset, 1)
+        await pipeline.execute()
+
+    async def getbits(self, key: str, offsets: Iterable[int]) -> list[int]:
+        pipeline = self._cache.pipeline(transaction=False)
+        for offset in offsets:
+            pipeline.getbit(key, offset)
+        return await pipeline.execute()
+
+    async def xadd(self, stream: str, entries: list[dict[str, str]]) -> list[str]:
+        pipeline = self._cache.pipeline(transaction=False)
+        for fields in entries:
+            pipeline.xadd(stream, fields)
+        return await pipeline.execute()
+
+    async def xgroup_create(self, stream: str, group: str) -> None:
+        try:
+            await self._cache.xgroup_create(stream, group, id="0", mkstream=True)
+        except redis.ResponseError as error:
+            if "BUSYGROUP" not in str(error):
+                raise
+
+    async def xreadgroup(
+        self, stream: str, group: str, consumer: str, count: int
+    ) -> list[tuple[str, dict[str, str]]]:
+        response = await self._cache.xreadgroup(group, consumer, {stream: ">"}, count=count)
+        return [entry for _, entries in response or [] for entry in entries]
+
+    async def xautoclaim(
+        self, stream: str, group: str, consumer: str, min_idle_ms: int, count: int
+    ) -> list[tuple[str, dict[str, str]]]:
+        response = await self._cache.xautoclaim(stream, group, consumer, min_idle_ms, count=count)
+        # entries deleted while pending come back as (None, None)
+        return [(entry_id, fields) for entry_id, fields in response[1] if entry_id]
+
+    async def xack(self, stream: str, group: str, entry_ids: list[str]) -> None:
+        if not entry_ids:
+            return
+        pipeline = self._cache.pipeline(transaction=False)
+        pipeline.xack(stream, group, *entry_ids)
+        pipeline.xdel(stream, *entry_ids)
+        await pipeline.execute()
+
     async def close(self) -> None:
         await self._cache.close()
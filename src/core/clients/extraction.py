@@ -0,0 +1,97 @@
+import json
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any
+
+import redis.asyncio as redis
+from loguru import logger
+
+from src.core.constants import EXTRACTOR_VERSION
+from src.core.factory import SingletonMeta
+from src.core.metrics import CacheStats
+from src.core.types import Extractor
+
+from .cache import CacheClient
+
+
+class ExtractionCache(metaclass=SingletonMeta):
+    """
+    Content-addressed cache of `extract_page` results.
+
+    Entries are keyed by a hash of the raw html plus the extractor backend and version,
+    so mirrored and syndicated copies of a document, and recrawls of an unchanged one,
+    skip parsing.
+    Lookups go through an in-process LRU of `capacity` entries first and then redis,
+    where entries live for `ttl_s` seconds; `ttl_s=0` keeps the cache in-process only.
+    Cache errors are counted and treated as misses so they never fail a crawl.
+    """
+
+    _initialized: bool = False
+
+    def __init__(
+        self,
+        cache: CacheClient | None,
+        capacity: int = 256,
+        ttl_s: int = 86400,
+        version: int = EXTRACTOR_VERSION,
+        key: str = "extract",
+    ) -> None:
+        if self._initialized:
+            return
+        self._cache = cache if ttl_s > 0 else None
+        self._capacity = capacity
+        self._ttl_s = ttl_s
+        self._prefix = f"{key}:v{version}"
+        self._local: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.stats = CacheStats()
+        self._initialized = True
+
+    @cached_property
+    def _tag(self) -> str:
+        return self.__class__.__name__
+
+    def _key(self, content_hash: str, extractor: Extractor) -> str:
+        return f"{self._prefix}:{extractor}:{content_hash}"
+
+    def _remember(self, key: str, extracted: dict[str, Any]) -> None:
+        if self._capacity <= 0:
+            return
+        self._local[key] = extracted
+        self._local.move_to_end(key)
+        while len(self._local) > self._capacity:
+            self._local.popitem(last=False)
+
+    async def get(self, content_hash: str, extractor: Extractor) -> dict[str, Any] | None:
+        key = self._key(content_hash, extractor)
+        extracted = self._local.get(key)
+        if extracted is not None:
+            self._local.move_to_end(key)
+            self.stats.local_hits += 1
+            return extracted
+
+        if self._cache is not None:
+            try:
+                value = await self._cache.get(key)
+            except redis.RedisError as error:
+                logger.warning(f"{self._tag}|get(): Cache read failed for {key}: {error}")
+                self.stats.errors += 1
+                value = None
+            if value is not None:
+                extracted = json.loads(value)
+                self._remember(key, extracted)
+                self.stats.remote_hits += 1
+                return extracted
+
+        self.stats.misses += 1
+        return None
+
+    async def set(self, content_hash: str, extractor: Extractor, extracted: dict[str, Any]) -> None:
+        key = self._key(content_hash, extractor)
+        self._remember(key, extracted)
+        if self._cache is None:
+            return
+        try:
+            await self._cache.set(key, json.dumps(extracted, ensure_ascii=False), ttl=self._ttl_s)
+        except redis.RedisError as error:
+            logger.warning(f"{self._tag}|set(): Cache write failed for {key}: {error}")
+            self.stats.errors += 1
@@ -2,23 +2,40 @@ from functools import cached_property
 from typing import Any
 
 import httpx
+import orjson
 from loguru import logger
 from pydantic import HttpUrl
 
 import src.core.common as common
 from src.core.config import settings
 from src.core.factory import SingletonMeta
+from src.core.formats import CanonicalUrl
+
+
+class ResponseTooLargeError(httpx.RequestError):
+    """The response body is larger than the client's `max_body_bytes`."""
 
 
 class HttpClient:
+    """
+    Async http client bound to one base url.
+
+    Responses are streamed and read up to `max_body_bytes`; a larger body aborts the
+    transfer with `ResponseTooLargeError` instead of being buffered. JSON is decoded
+    with orjson straight from the bytes. Bodies are only logged when
+    `log_payload_chars` is set, and then only their first `log_payload_chars` chars.
+    """
+
     _initialized: bool = False
     _client: httpx.AsyncClient
 
     def __init__(
         self,
-        base_url: HttpUrl | None = None,
+        base_url: HttpUrl | CanonicalUrl | None = None,
         headers: dict[str, str] | None = None,
         timeout: httpx.Timeout | float | None = None,
+        max_body_bytes: int | None = None,
+        log_payload_chars: int | None = None,
     ) -> None:
         base_url: str = str(base_url).rstrip("/") if base_url else ""
         headers: dict[str, str] | None = headers
@@ -34,6 +51,10 @@ class HttpClient:
             timeout=timeout,
             follow_redirects=True,
         )
+        self._max_body_bytes = max_body_bytes or settings.httpx_max_body_bytes
+        self._log_payload_chars = (
+            settings.httpx_log_payload_chars if log_payload_chars is None else log_payload_chars
+        )
 
     @cached_property
     def _tag(self) -> str:
@@ -43,9 +64,45 @@ class HttpClient:
         logger.debug(f"{self._tag}|close(): Closing HTTP client")
         await self._client.aclose()
 
+    async def _read_body(self, response: httpx.Response) -> bytearray:
+        declared = response.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > self._max_body_bytes:
+            raise ResponseTooLargeError(
+                f"Content-Length {declared} exceeds {self._max_body_bytes} bytes", request=response.request
+            )
+
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > self._max_body_bytes:
+                raise ResponseTooLargeError(
+                    f"Body exceeds {self._max_body_bytes} bytes", request=response.request
+                )
+        # Both decoders take the buffer as is, so it is never copied
+        return body
+
+    def _payload_preview(self, body: bytearray) -> str:
+        if not self._log_payload_chars:
+            return ""
+        preview = body[:self._log_payload_chars * 4].decode("utf-8", errors="replace")
+        return f" payload[{preview[:self._log_payload_chars]}]"
+
+    async def _send(self, method: str, path: str, as_text: bool, **kwargs: Any) -> str | dict[str, Any]:
+        async with self._client.stream(method, path, **kwargs) as response:
+            response.raise_for_status()
+            body = await self._read_body(response)
+
+        logger.debug(
+            f"{self._tag}|{method.lower()}(): status_code[{response.status_code}] "
+            f"response_bytes[{len(body)}]{self._payload_preview(body)}"
+        )
+        if as_text:
+            return body.decode(response.encoding or "utf-8", errors="replace")
+        return orjson.loads(body)
+
     async def get(
         self,
-        url: HttpUrl,
+        url: HttpUrl | CanonicalUrl,
         params: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
         as_text: bool = False,
@@ -56,27 +113,11 @@ class HttpClient:
             f"path[{path}] full_url[{url}] params[{params}] headers[{headers}]"
         )
 
-        response = await self._client.get(path, params=params, headers=headers)
-        response.raise_for_status()
-
-        if as_text:
-            content = response.text
-            logger.debug(
-                f"{self._tag}|get(): status_code[{response.status_code}] "
-                f"response_text_length[{len(content)}]"
-            )
-        else:
-            content = response.json()
-            logger.debug(
-                f"{self._tag}|get(): status_code[{response.status_code}] "
-                f"response_json[{content}]"
-            )
-
-        return content
+        return await self._send("GET", path, as_text, params=params, headers=headers)
 
     async def post(
         self,
-        url: HttpUrl,
+        url: HttpUrl | CanonicalUrl,
         data: dict[str, Any],
         headers: dict[str, str] | None = None,
         as_text: bool = False,
@@ -87,33 +128,17 @@ class HttpClient:
             f"path[{path}] data[{data}] headers[{headers}]"
         )
 
-        response = await self._client.post(path, json=data, headers=headers)
-        response.raise_for_status()
-
-        if as_text:
-            content = response.text
-            logger.debug(
-                f"{self._tag}|post(): status_code[{response.status_code}] "
-                f"response_text_length[{len(content)}]"
-            )
-        else:
-            content = response.json()
-            logger.debug(
-                f"{self._tag}|post(): status_code[{response.status_code}] "
-                f"response_json[{content}]"
-            )
-
-        return content
+        return await self._send("POST", path, as_text, json=data, headers=headers)
 
 
 class HttpClientFactory(metaclass=SingletonMeta):
     _initialized: bool = False
-    _clients: dict[HttpUrl, HttpClient]
+    _clients: dict[CanonicalUrl, HttpClient]
 
     def __init__(self) -> None:
         if self._initialized:
             return
-        self._clients: dict[HttpUrl, HttpClient] = {}
+        self._clients: dict[CanonicalUrl, HttpClient] = {}
         self._initialized = True
 
     @cached_property
@@ -122,10 +147,10 @@ class HttpClientFactory(metaclass=SingletonMeta):
 
     def get_client(
         self,
-        url: HttpUrl,
+        url: HttpUrl | CanonicalUrl,
         headers: dict[str, str] | None = None,
     ) -> HttpClient:
-        base_url: HttpUrl = common.get_base_url(url)
+        base_url: CanonicalUrl = common.get_base_url(url)
         logger.debug(f"{self._tag}|get_client(): base_url[{base_url}]")
         if base_url not in self._clients:
             logger.debug(
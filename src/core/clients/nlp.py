@@ -0,0 +1,102 @@
+from collections import Counter
+from collections.abc import Iterable
+from functools import cached_property
+from typing import Any
+
+from loguru import logger
+
+from src.core.constants import NLP_KEYWORDS
+from src.core.factory import SingletonMeta
+
+# Parts of speech kept as keyword candidates when the model has a tagger
+_KEYWORD_POS = frozenset({"NOUN", "PROPN", "ADJ"})
+
+
+def _keywords(doc: Any, limit: int) -> list[dict[str, Any]]:
+    counts: Counter[str] = Counter()
+    for token in doc:
+        if token.is_stop or token.is_punct or not token.is_alpha or len(token) < 3:
+            continue
+        if token.pos_ and token.pos_ not in _KEYWORD_POS:
+            continue
+        counts[(token.lemma_ or token.text).lower()] += 1
+    return [{"lemma": lemma, "count": count} for lemma, count in counts.most_common(limit)]
+
+
+def _annotate(doc: Any, keywords: int) -> dict[str, list[Any]]:
+    return {
+        "entities": [
+            {"text": ent.text, "label": ent.label_, "start": ent.start_char, "end": ent.end_char}
+            for ent in doc.ents
+        ],
+        "keywords": _keywords(doc, keywords),
+        "sentences": [[sent.start_char, sent.end_char] for sent in doc.sents],
+    }
+
+
+class NlpClient(metaclass=SingletonMeta):
+    """
+    spaCy pipeline loaded once per process and run over texts in batches.
+
+    Components in `exclude` are never loaded. Sentence boundaries come from `senter`
+    when the parser is excluded, which is much cheaper than parsing; models without
+    either get the rule-based `sentencizer`. With `n_process > 1`, `nlp.pipe` fans the
+    batches out to worker processes, each with its own copy of the model.
+    """
+
+    _initialized: bool = False
+
+    def __init__(
+        self,
+        model: str = "en_core_web_sm",
+        batch_size: int = 64,
+        n_process: int = 1,
+        exclude: Iterable[str] = ("parser",),
+        max_chars: int = 100_000,
+        keywords: int = NLP_KEYWORDS,
+    ) -> None:
+        if self._initialized:
+            return
+        self.model = model
+        self._batch_size = batch_size
+        self._n_process = n_process
+        self._exclude = list(exclude)
+        self._max_chars = max_chars
+        self._keywords = keywords
+        self._nlp: Any = None
+        self._initialized = True
+
+    @cached_property
+    def _tag(self) -> str:
+        return self.__class__.__name__
+
+    @property
+    def model_version(self) -> str | None:
+        return self._nlp.meta.get("version") if self._nlp is not None else None
+
+    def load(self) -> None:
+        if self._nlp is not None:
+            return
+        # Imported on first use: loading spaCy takes seconds and only the NLP job needs it
+        import spacy
+
+        nlp = spacy.load(self.model, exclude=self._exclude)
+        if "senter" in nlp.disabled:
+            nlp.enable_pipe("senter")
+        if not {"parser", "senter", "sentencizer"} & set(nlp.pipe_names):
+            nlp.add_pipe("sentencizer")
+        self._nlp = nlp
+        logger.info(f"{self._tag}|load(): Loaded {self.model} {self.model_version} with {nlp.pipe_names}")
+
+    def annotate(self, texts: list[str]) -> list[dict[str, list[Any]]]:
+        """
+        Entities, keywords and sentence boundaries of every text, in order. Offsets are
+        character offsets into the text, which is cut to `max_chars`.
+        """
+        self.load()
+        docs = self._nlp.pipe(
+            (text[:self._max_chars] for text in texts),
+            batch_size=self._batch_size,
+            n_process=self._n_process,
+        )
+        return [_annotate(doc, self._keywords) for doc in docs]
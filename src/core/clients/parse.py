@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from src.core.factory import SingletonMeta
+from src.core.metrics import ParseStats
+
+_ResultT = TypeVar("_ResultT")
+
+
+def _timed(fn: Callable[..., _ResultT], *args: Any) -> tuple[_ResultT, float]:
+    started_at = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started_at
+
+
+class ParseExecutor(metaclass=SingletonMeta):
+    """
+    Runs CPU-bound parsing in a process pool so large pages do not block the event loop.
+
+    At most `max_pending` jobs are submitted at once; further callers wait for a slot,
+    which bounds memory and pushes back on the crawl workers when parsing cannot keep
+    up. With `workers=0` jobs run inline on the loop, as before. `fn` and its arguments
+    must be picklable, so pass module-level functions.
+    """
+
+    _initialized: bool = False
+
+    def __init__(self, workers: int = 2, max_pending: int = 32) -> None:
+        if self._initialized:
+            return
+        self._workers = workers
+        self._max_pending = max(max_pending, workers, 1)
+        self._semaphore = asyncio.Semaphore(self._max_pending)
+        self._pool: ProcessPoolExecutor | None = None
+        self.stats = ParseStats()
+        self._initialized = True
+
+    @cached_property
+    def _tag(self) -> str:
+        return self.__class__.__name__
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            logger.debug(f"{self._tag}|_get_pool(): Starting {self._workers} parse processes")
+            # spawn: forking a process that holds an event loop and db connections is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def run(self, fn: Callable[..., _ResultT], *args: Any) -> _ResultT:
+        self.stats.submitted += 1
+        self.stats.pending += 1
+        submitted_at = time.perf_counter()
+        try:
+            async with self._semaphore:
+                if self._workers > 0:
+                    loop = asyncio.get_running_loop()
+                    result, parse_s = await loop.run_in_executor(self._get_pool(), _timed, fn, *args)
+                else:
+                    result, parse_s = _timed(fn, *args)
+        except BrokenProcessPool:
+            # A child died (e.g. OOM on a huge page); start a fresh pool for the next job
+            logger.error(f"{self._tag}|run(): Parse pool broken, restarting")
+            self._shutdown_pool(wait=False)
+            self.stats.failed += 1
+            raise
+        except Exception:
+            self.stats.failed += 1
+            raise
+        finally:
+            self.stats.pending -= 1
+
+        # Wait covers the slot, the pool queue and the round trip to the child
+        self.stats.record(time.perf_counter() - submitted_at - parse_s, parse_s)
+        return result
+
+    def _shutdown_pool(self, wait: bool) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    async def close(self) -> None:
+        logger.debug(f"{self._tag}|close(): Shutting down parse pool: {self.stats}")
+        await asyncio.to_thread(self._shutdown_pool, True)
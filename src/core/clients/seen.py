@@ -0,0 +1,95 @@
+import hashlib
+import math
+from collections.abc import AsyncIterable
+from functools import cached_property
+
+from loguru import logger
+
+from src.core.types import SeenMode
+
+from .cache import CacheClient
+
+# redis strings (and so bitmaps) are capped at 512MB
+_BLOOM_MAX_BITS = 2 ** 32
+
+
+class SeenUrlFilter:
+    """
+    Seen-url layer kept in the cache in front of the `url` table.
+
+    `SeenMode.SET` stores every url in a redis set and answers exactly.
+    `SeenMode.BLOOM` keeps a fixed-size bloom filter in a redis bitmap sized for
+    `capacity` urls at `error_rate`; it never misses a stored url, but may report an
+    unknown url as seen with probability `error_rate`.
+    """
+
+    def __init__(
+        self,
+        cache: CacheClient,
+        mode: SeenMode,
+        key: str = "seen:url",
+        capacity: int = 10_000_000,
+        error_rate: float = 0.001,
+    ) -> None:
+        self._cache = cache
+        self._mode = mode
+        self._key = f"{key}:{mode}"
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._bits = min(bits, _BLOOM_MAX_BITS)
+        self._hashes = max(1, round(self._bits / capacity * math.log(2)))
+
+    @cached_property
+    def _tag(self) -> str:
+        return self.__class__.__name__
+
+    def _offsets(self, url: str) -> list[int]:
+        # double hashing: k positions derived from two 64-bit halves of one digest
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self._bits for index in range(self._hashes)]
+
+    async def contains(self, urls: list[str]) -> list[bool]:
+        if not urls:
+            return []
+        if self._mode == SeenMode.SET:
+            return await self._cache.smismember(self._key, urls)
+
+        offsets = [offset for url in urls for offset in self._offsets(url)]
+        bits = await self._cache.getbits(self._key, offsets)
+        return [
+            all(bits[index:index + self._hashes])
+            for index in range(0, len(bits), self._hashes)
+        ]
+
+    async def add(self, urls: list[str], key: str | None = None) -> None:
+        if not urls:
+            return
+        key = key or self._key
+        if self._mode == SeenMode.SET:
+            await self._cache.sadd(key, *urls)
+        else:
+            await self._cache.setbits(key, (offset for url in urls for offset in self._offsets(url)))
+
+    async def rebuild(self, batches: AsyncIterable[list[str]]) -> int:
+        """
+        Warms a fresh filter from `batches` and swaps it in atomically.
+
+        Returns:
+            int: Number of urls added.
+        """
+        building_key = f"{self._key}:rebuild"
+        await self._cache.delete(building_key)
+
+        total = 0
+        async for urls in batches:
+            await self.add(urls, key=building_key)
+            total += len(urls)
+            logger.debug(f"{self._tag}|rebuild(): Added {total} urls")
+
+        if total:
+            await self._cache.rename(building_key, self._key)
+        else:
+            await self._cache.delete(self._key)
+        logger.info(f"{self._tag}|rebuild(): Rebuilt {self._key} with {total} urls")
+        return total
@@ -3,11 +3,10 @@ from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 from loguru import logger
-from pydantic import HttpUrl, ValidationError
+from pydantic import HttpUrl
 
-import src.core.common as common
 from src.core.factory import SingletonMeta
-from src.core.formats import serialize
+from src.core.formats import CanonicalUrl
 
 
 class SoupClient(metaclass=SingletonMeta):
@@ -27,15 +26,15 @@ class SoupClient(metaclass=SingletonMeta):
         url: HttpUrl,
         content: str,
         parser: str = "html.parser",
-    ) -> list[HttpUrl]:
+    ) -> list[CanonicalUrl]:
         soup = BeautifulSoup(content, parser)
         raw_urls = [a["href"] for a in soup.find_all("a", href=True)]
 
         logger.debug(f"{self._tag}|extract_urls(): urls {raw_urls}")
 
 
-        base_url = common.get_base_url(url)
-        urls: set[HttpUrl] = set()
+        base_url = CanonicalUrl.parse(url).base_url
+        urls: set[CanonicalUrl] = set()
         for href in raw_urls:
             # Skip bad or useless hrefs
             if (
@@ -48,11 +47,11 @@ class SoupClient(metaclass=SingletonMeta):
                 continue
 
             # Resolve relative URL → absolute
-            absolute_url = urljoin(serialize(base_url), href)
+            absolute_url = urljoin(base_url, href)
 
             try:
-                urls.add(HttpUrl(absolute_url))
-            except ValidationError:
+                urls.add(CanonicalUrl.parse(absolute_url))
+            except ValueError:
                 logger.warning(
                     f"{self._tag}|extract_urls(): Skipped invalid URL -> {absolute_url}"
                 )
@@ -5,7 +5,6 @@ from collections.abc import Mapping, Sequence
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Annotated, Any, TypeVar
-from urllib.parse import urlparse
 
 import redis.asyncio as redis
 import toml
@@ -13,7 +12,8 @@ from bs4 import BeautifulSoup
 from pydantic import Field, HttpUrl
 
 from src.core.clients import CacheClient
-from src.core.formats import serialize
+from src.core.constants import URL_HASH_SIZE
+from src.core.formats import CanonicalUrl, serialize
 
 K = TypeVar("K")
 V = TypeVar("V")
@@ -43,40 +43,30 @@ async def get_cache_health(
         return False
 
 
-def get_base_url(url: HttpUrl) -> HttpUrl:
+def get_base_url(url: HttpUrl | str) -> CanonicalUrl:
     """
     Extracts the base URL from a given URL.
 
     Parameters:
-        url (HttpUrl): The full URL.
+        url (HttpUrl | str): The full URL.
 
     Returns:
-        HttpUrl: The base URL (scheme + domain).
+        CanonicalUrl: The base URL (scheme + domain), shared by every url on the origin.
     """
-    parsed_url = urlparse(serialize(url))
-    return HttpUrl.build(
-        scheme=parsed_url.scheme,
-        host=parsed_url.hostname,  # hostname only, no port
-        port=parsed_url.port,  # optional
-        path=""  # empty path
-    )
+    return CanonicalUrl.parse(url).base_url
 
 
-def get_path(url: HttpUrl) -> str:
+def get_path(url: HttpUrl | str) -> str:
     """
     Extracts the path and query string from a given URL.
 
     Parameters:
-        url (HttpUrl): The full URL.
+        url (HttpUrl | str): The full URL.
 
     Returns:
         str: The path and query portion of the URL.
     """
-    parsed_url = urlparse(serialize(url))
-    path = parsed_url.path or "/"
-    if parsed_url.query:
-        path += f"?{parsed_url.query}"
-    return path
+    return CanonicalUrl.parse(url).path_query
 
 
 def get_file_extension_with_dot(filename: str) -> str | None:
@@ -233,4 +223,9 @@ def html_to_json(url: HttpUrl, html: str) -> dict[str, Any]:
 def compute_checksum(content: dict[str, Any]) -> str:
     content_str: str = json.dumps(content, sort_keys=True)
     content_bytes: bytes = content_str.encode('utf-8')
-    return hashlib.sha256(content_bytes).hexdigest()
\ No newline at end of file
+    return hashlib.sha256(content_bytes).hexdigest()
+
+
+def compute_url_hash(url: str) -> bytes:
+    """Fixed-width lookup key of a canonical url: the first bytes of its SHA-256."""
+    return hashlib.sha256(url.encode("utf-8")).digest()[:URL_HASH_SIZE]
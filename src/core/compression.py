@@ -0,0 +1,102 @@
+import codecs
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from functools import cached_property
+
+import zstandard
+
+from src.core.factory import SingletonMeta
+
+
+class HtmlCodec(metaclass=SingletonMeta):
+    """
+    zstd codec for stored page bodies, with optional per-host dictionaries.
+
+    Every body is a self-contained zstd frame. A frame compressed with a dictionary
+    records the dictionary id in its header, so `decompress` picks the right one without
+    knowing the host; plain frames (dict id 0) need no dictionary at all. Dictionaries
+    are registered by the repo that loads them from the database.
+    """
+
+    _initialized: bool = False
+
+    def __init__(self, level: int = 3) -> None:
+        if self._initialized:
+            return
+        self._level = level
+        self._plain = zstandard.ZstdCompressor(level=level)
+        self._compressors: dict[int, zstandard.ZstdCompressor] = {}
+        self._decompressors: dict[int, zstandard.ZstdDecompressor] = {0: zstandard.ZstdDecompressor()}
+        self._hosts: dict[str, int] = {}
+        self.loaded_at: float | None = None
+        self._initialized = True
+
+    @cached_property
+    def _tag(self) -> str:
+        return self.__class__.__name__
+
+    def register(self, dict_id: int, content: bytes, hosts: Iterable[str] = ()) -> None:
+        """Makes a trained dictionary available, and the default for `hosts`."""
+        if dict_id not in self._decompressors:
+            dict_data = zstandard.ZstdCompressionDict(content)
+            self._compressors[dict_id] = zstandard.ZstdCompressor(level=self._level, dict_data=dict_data)
+            self._decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        for host in hosts:
+            self._hosts[host] = dict_id
+
+    def mark_loaded(self) -> None:
+        self.loaded_at = time.monotonic()
+
+    def has_dict(self, dict_id: int) -> bool:
+        return dict_id in self._decompressors
+
+    def host_dict_id(self, host: str) -> int:
+        """Dictionary `compress` uses for `host`, 0 for none."""
+        return self._hosts.get(host, 0)
+
+    @staticmethod
+    def frame_dict_id(body: bytes) -> int:
+        """Id of the dictionary a frame was compressed with, 0 for none."""
+        return zstandard.get_frame_parameters(body).dict_id
+
+    @staticmethod
+    def dictionary_id(content: bytes) -> int:
+        return zstandard.ZstdCompressionDict(content).dict_id()
+
+    def compress(self, html: str, host: str | None = None) -> bytes:
+        dict_id = self._hosts.get(host) if host else None
+        compressor = self._compressors[dict_id] if dict_id else self._plain
+        return compressor.compress(html.encode("utf-8"))
+
+    def decompress(self, body: bytes) -> str:
+        """
+        Raises:
+            KeyError: If the frame needs a dictionary that was not registered.
+        """
+        return self._decompressors[self.frame_dict_id(body)].decompress(body).decode("utf-8")
+
+    async def decompress_stream(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+        """
+        Html of one frame as it is decompressed, without holding the whole page.
+
+        The first chunk has to contain the frame header.
+
+        Raises:
+            KeyError: If the frame needs a dictionary that was not registered.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        decompressor = None
+        async for chunk in chunks:
+            if decompressor is None:
+                decompressor = self._decompressors[self.frame_dict_id(chunk)].decompressobj()
+            text = decoder.decode(decompressor.decompress(chunk))
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def train_dictionary(samples: list[str], size: int = 112_640) -> zstandard.ZstdCompressionDict:
+    """Trains a dictionary of at most `size` bytes from sample pages of one host."""
+    return zstandard.train_dictionary(size, [sample.encode("utf-8") for sample in samples])
@@ -5,7 +5,7 @@ from urllib.parse import quote_plus
 from pydantic import Field, HttpUrl, RedisDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from .types import Env
+from .types import BlobBackend, Env, Extractor, QueueBackend, SeenMode
 
 
 class Settings(BaseSettings):
@@ -20,6 +20,9 @@ class Settings(BaseSettings):
     db_user: Annotated[str, Field(description="Database user")]
     db_password: Annotated[str, Field(description="Database password")]
     db_root_password: Annotated[str, Field(description="Root database password")]
+    data_compression_level: Annotated[int, Field(default=3, ge=1, le=22, description="zstd level for page bodies")]
+    data_blob_store: Annotated[BlobBackend, Field(default=BlobBackend.DB, description="Where page bodies are stored")]
+    data_blob_root: Annotated[str, Field(default="blobs", description="Root directory of the local blob store")]
     # cache
     cache_connection: Annotated[str, Field(description="Cache connection type")]
     cache_host: Annotated[str, Field(description="Cache host")]
@@ -31,11 +34,37 @@ class Settings(BaseSettings):
     crawl_server_host: Annotated[str, Field(description="Crawl server host")]
     crawl_server_port: Annotated[int, Field(description="Crawl server port")]
     crawl_url_expiration: Annotated[int, Field(description="URL expiration time (seconds)")]
+    crawl_workers: Annotated[int, Field(default=1, ge=1, description="Concurrent crawl workers")]
+    crawl_claim_batch_size: Annotated[int, Field(default=16, ge=1, description="Tasks claimed per frontier query")]
+    crawl_bulk_batch_size: Annotated[int, Field(default=500, ge=1, description="Rows per bulk frontier insert")]
+    crawl_host_delay: Annotated[float, Field(default=1.0, ge=0, description="Seconds between requests per host")]
+    crawl_host_concurrency: Annotated[int, Field(default=1, ge=1, description="Concurrent requests per host")]
+    crawl_queue: Annotated[QueueBackend, Field(default=QueueBackend.SQL, description="Crawl queue backend")]
+    crawl_queue_min_idle_ms: Annotated[int, Field(default=300_000, description="Idle time before reclaiming")]
+    crawl_seen_filter: Annotated[SeenMode | None, Field(default=None, description="Seen-url filter mode")]
+    crawl_seen_capacity: Annotated[int, Field(default=10_000_000, description="Expected urls for bloom filter")]
+    crawl_seen_error_rate: Annotated[float, Field(default=0.001, description="Bloom filter false positive rate")]
+    crawl_parse_workers: Annotated[int, Field(default=2, ge=0, description="Parse processes, 0 parses inline")]
+    crawl_parse_max_pending: Annotated[int, Field(default=32, ge=1, description="Parse jobs in flight")]
+    crawl_extractor: Annotated[Extractor, Field(default=Extractor.HTML_TO_JSON, description="Default extractor")]
+    crawl_extractor_hosts: Annotated[dict[str, Extractor], Field(default_factory=dict, description="Host extractors")]
+    crawl_extract_cache: Annotated[bool, Field(default=True, description="Cache extractions by content hash")]
+    crawl_extract_cache_size: Annotated[int, Field(default=256, ge=0, description="In-process extraction LRU entries")]
+    crawl_extract_cache_ttl: Annotated[int, Field(default=86400, ge=0, description="Redis extraction TTL, 0 is off")]
+    crawl_worker_grace: Annotated[float, Field(default=30.0, ge=0, description="Seconds to drain on shutdown")]
+    # nlp
+    nlp_model: Annotated[str, Field(default="en_core_web_sm", description="spaCy model package")]
+    nlp_batch_size: Annotated[int, Field(default=64, ge=1, description="Texts per nlp.pipe batch")]
+    nlp_n_process: Annotated[int, Field(default=1, ge=1, description="nlp.pipe processes")]
+    nlp_exclude: Annotated[list[str], Field(default=["parser"], description="Pipeline components not loaded")]
+    nlp_max_chars: Annotated[int, Field(default=100_000, ge=1, description="Text chars annotated per page")]
     # httpx
     httpx_connect: Annotated[float, Field(description="HTTPX connect timeout")]
     httpx_read: Annotated[float, Field(description="HTTPX read timeout")]
     httpx_write: Annotated[float, Field(description="HTTPX write timeout")]
     httpx_pool: Annotated[float, Field(description="HTTPX pool timeout")]
+    httpx_max_body_bytes: Annotated[int, Field(default=32 * 1024 * 1024, ge=1, description="Largest response body")]
+    httpx_log_payload_chars: Annotated[int, Field(default=0, ge=0, description="Logged body chars, 0 is off")]
 
     model_config = SettingsConfigDict(
         env_file=".env",
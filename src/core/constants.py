@@ -28,3 +28,23 @@ EXCEPTION_ERROR_TYPE_MAP: dict[type[Exception], ErrorType] = {
     NotImplementedError: ErrorType.NOT_IMPLEMENTED,
 }
 
+
+CRAWL_IDLE_DELAY_S: float = 0.5
+CRAWL_STATS_INTERVAL: int = 100
+# Claimed tasks a crawl run keeps waiting per host
+CRAWL_HOST_BUFFER: int = 4
+URL_MAX_LENGTH: int = 2048
+# Bytes of SHA-256 kept as the url lookup key
+URL_HASH_SIZE: int = 16
+
+CRAWL_QUEUE_STREAM: str = "crawl:tasks"
+CRAWL_QUEUE_GROUP: str = "crawlers"
+CRAWL_JOB_TTL_S: int = 7 * 24 * 3600
+
+# Bump whenever the output of `extract.extract_page` changes, so cached extractions are not reused
+EXTRACTOR_VERSION: int = 1
+
+# How long a process trusts its loaded compression dictionaries before checking for new ones
+DATA_DICT_REFRESH_S: float = 600.0
+
+NLP_KEYWORDS: int = 20
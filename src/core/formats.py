@@ -1,7 +1,10 @@
+import re
+import sys
 import uuid
 from datetime import UTC, date, datetime, time
 from enum import Enum
-from typing import Any
+from functools import cached_property, lru_cache
+from typing import Any, Self
 from urllib.parse import unquote, urlsplit, urlunsplit
 
 from pydantic import BaseModel, HttpUrl, RedisDsn, SecretStr, ValidationError, WebsocketUrl
@@ -21,7 +24,7 @@ def serialize(obj: Any, instructions: dict[type, type] | None = None) -> Any:
             if isinstance(obj, key):
                 return value(obj)
 
-    if isinstance(obj, HttpUrl | RedisDsn | WebsocketUrl):
+    if isinstance(obj, HttpUrl | RedisDsn | WebsocketUrl | CanonicalUrl):
         return str(obj).strip("/")
     elif isinstance(obj, BaseModel):
         return serialize(obj.model_dump())
@@ -51,10 +54,96 @@ def serialize(obj: Any, instructions: dict[type, type] | None = None) -> Any:
     else:
         raise TypeError(f"Object of type {type(obj)} is not serializable")
 
-def clean_url(url: str | HttpUrl) -> HttpUrl:
-    # Convert HttpUrl → str if needed
-    url = str(url)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# HttpUrl's own limit
+_URL_MAX_LENGTH = 2083
+# Urls that pydantic's HttpUrl would return unchanged apart from lowercasing the scheme
+# and host: plain ascii hosts not ending in a number (no IPv4 or punycode handling), no
+# port, userinfo or fragment, and only characters WHATWG leaves unencoded. Anything else
+# falls back to HttpUrl, so both paths give the same canonical string.
+_PLAIN_URL = re.compile(
+    r"(?P<scheme>https?)://"
+    r"(?P<host>(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)*[a-z](?:[a-z0-9-]*[a-z0-9])?)"
+    r"(?P<path>/(?:[a-z0-9\-._~!$&'()*+,;=:@/]|%[0-9a-f]{2})*)?"
+    r"(?P<query>\?(?:[a-z0-9\-._~!$&()*+,;=:@/?]|%[0-9a-f]{2})*)?",
+    re.ASCII | re.IGNORECASE,
+)
+_DOT_SEGMENT = re.compile(r"/\.\.?(?:/|$)|%2e", re.IGNORECASE)
+
+
+class CanonicalUrl(str):
+    """
+    Canonical http(s) url string, as `serialize(HttpUrl(url))` would produce it.
+
+    Being a `str`, it is hashable, compares equal to the stored url and can be used
+    wherever a url string is expected; `serialize` turns it into a plain `str`.
+    Parsing is memoized per input string, hosts are interned and the base url is split
+    once per url and shared by every url on the same origin, so hot paths that see the
+    same links page after page skip pydantic validation entirely.
+    """
+
+    scheme: str
+    host: str
+    port: int | None
+    path: str
+    query: str
+
+    def __new__(cls, value: str) -> Self:
+        url = super().__new__(cls, value)
+        parts = urlsplit(value)
+        url.scheme = parts.scheme
+        url.host = sys.intern(parts.hostname or "")
+        url.port = parts.port if parts.port != _DEFAULT_PORTS.get(parts.scheme) else None
+        url.path = parts.path
+        url.query = parts.query
+        return url
+
+    @classmethod
+    def parse(cls, url: "str | HttpUrl | CanonicalUrl") -> "CanonicalUrl":
+        """
+        Canonical form of `url`.
+
+        Raises:
+            ValueError: If `url` is not a valid http(s) url.
+        """
+        if isinstance(url, CanonicalUrl):
+            return url
+        return _parse_url(str(url))
+
+    @cached_property
+    def base_url(self) -> "CanonicalUrl":
+        """Scheme, host and non-default port."""
+        return _base_url(self.scheme, self.host, self.port)
+
+    @property
+    def path_query(self) -> str:
+        """Path and query string, as sent in the request line."""
+        path = self.path or "/"
+        return f"{path}?{self.query}" if self.query else path
+
+
+@lru_cache(maxsize=65536)
+def _parse_url(url: str) -> CanonicalUrl:
+    plain = _PLAIN_URL.fullmatch(url) if len(url) <= _URL_MAX_LENGTH and "xn--" not in url else None
+    if plain and not _DOT_SEGMENT.search(plain["path"] or ""):
+        scheme, host = plain["scheme"].lower(), plain["host"].lower()
+        canonical = f"{scheme}://{host}{plain['path'] or '/'}{plain['query'] or ''}"
+    else:
+        try:
+            canonical = str(HttpUrl(url))
+        except ValidationError as e:
+            raise ValueError(f"Invalid URL: {url}") from e
+    return CanonicalUrl(canonical.strip("/"))
+
+
+@lru_cache(maxsize=8192)
+def _base_url(scheme: str, host: str, port: int | None) -> CanonicalUrl:
+    host = f"[{host}]" if ":" in host else host
+    return CanonicalUrl(f"{scheme}://{host}:{port}" if port is not None else f"{scheme}://{host}")
 
+
+@lru_cache(maxsize=65536)
+def _clean_url(url: str) -> CanonicalUrl:
     # Strip whitespace & invisible chars
     url = url.strip()
     url = "".join(ch for ch in url if ch.isprintable())
@@ -66,8 +155,12 @@ def clean_url(url: str | HttpUrl) -> HttpUrl:
     parsed = urlsplit(url)
     clean = urlunsplit((parsed.scheme, parsed.netloc, parsed.path, parsed.query, parsed.fragment))
 
-    # Validate and return as HttpUrl
     try:
-        return HttpUrl(clean)  # Pydantic v2
-    except ValidationError as e:
-        raise ValueError(f"Invalid URL after cleaning: {clean}") from e
\ No newline at end of file
+        return _parse_url(clean)
+    except ValueError as e:
+        raise ValueError(f"Invalid URL after cleaning: {clean}") from e
+
+
+def clean_url(url: str | HttpUrl) -> CanonicalUrl:
+    # Convert HttpUrl → str if needed
+    return _clean_url(str(url))
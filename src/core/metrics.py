@@ -0,0 +1,126 @@
+import time
+from dataclasses import dataclass, field
+
+from src.core.types import State
+
+
+@dataclass
+class CrawlStats:
+    workers: int = 1
+    completed: int = 0
+    failed: int = 0
+    queued: int = 0
+    active: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        return self.completed + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Processed pages per second since the crawl started."""
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def record(self, state: State) -> None:
+        if state == State.COMPLETED:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    def __str__(self) -> str:
+        return (
+            f"workers[{self.workers}] completed[{self.completed}] failed[{self.failed}] "
+            f"queued[{self.queued}] "
+            f"elapsed[{self.elapsed:.1f}s] rate[{self.rate:.2f} pages/s]"
+        )
+
+
+@dataclass
+class ParseStats:
+    """Time spent waiting for a pool slot versus parsing, summed over all jobs."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    pending: int = 0
+    wait_s: float = 0.0
+    parse_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    @property
+    def avg_wait_ms(self) -> float:
+        return self.wait_s / self.completed * 1000 if self.completed else 0.0
+
+    @property
+    def avg_parse_ms(self) -> float:
+        return self.parse_s / self.completed * 1000 if self.completed else 0.0
+
+    def record(self, wait_s: float, parse_s: float) -> None:
+        self.completed += 1
+        self.wait_s += wait_s
+        self.parse_s += parse_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+
+    def __str__(self) -> str:
+        return (
+            f"parsed[{self.completed}] failed[{self.failed}] pending[{self.pending}] "
+            f"wait[{self.avg_wait_ms:.1f}ms avg, {self.max_wait_s * 1000:.1f}ms max] "
+            f"parse[{self.avg_parse_ms:.1f}ms avg]"
+        )
+
+
+@dataclass
+class CacheStats:
+    """Lookups answered by the in-process LRU, by redis, or by neither."""
+
+    local_hits: int = 0
+    remote_hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.local_hits + self.remote_hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.lookups
+        return (self.local_hits + self.remote_hits) / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"lookups[{self.lookups}] local[{self.local_hits}] remote[{self.remote_hits}] "
+            f"misses[{self.misses}] errors[{self.errors}] hit_ratio[{self.hit_ratio:.1%}]"
+        )
+
+
+@dataclass
+class NlpStats:
+    """Pages seen by one NLP run, and the time spent inside spaCy."""
+
+    scanned: int = 0
+    annotated: int = 0
+    chars: int = 0
+    nlp_s: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Annotated pages per second of spaCy time."""
+        return self.annotated / self.nlp_s if self.nlp_s > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"scanned[{self.scanned}] annotated[{self.annotated}] chars[{self.chars}] "
+            f"nlp[{self.nlp_s:.1f}s, {self.rate:.1f} pages/s] elapsed[{self.elapsed:.1f}s]"
+        )
@@ -0,0 +1,139 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+_ItemT = TypeVar("_ItemT")
+
+
+@dataclass
+class _HostState(Generic[_ItemT]):
+    tokens: float
+    refilled_at: float
+    # (pushed_at, item), oldest first
+    ready: deque[tuple[float, _ItemT]] = field(default_factory=deque)
+    active: int = 0
+
+
+class HostScheduler(Generic[_ItemT]):
+    """
+    Per-host politeness scheduler.
+
+    Items are queued per host and handed out round-robin across hosts. A host is only
+    served while it has a token (refilled at one per `delay_s` seconds, up to `burst`)
+    and fewer than `concurrency` items in flight, so one large site cannot dominate
+    the crawl while other hosts keep the workers busy. With `max_ready`, a host holds
+    at most that many waiting items, so it cannot fill the buffer either.
+    """
+
+    def __init__(
+        self, delay_s: float = 1.0, concurrency: int = 1, burst: int = 1, max_ready: int | None = None
+    ) -> None:
+        self._delay_s = delay_s
+        self._concurrency = concurrency
+        self._burst = burst
+        self._max_ready = max_ready
+        self._hosts: dict[str, _HostState[_ItemT]] = {}
+        self._order: deque[str] = deque()
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def _refill(self, state: _HostState[_ItemT], now: float) -> None:
+        if self._delay_s <= 0:
+            state.tokens = self._burst
+            return
+        state.tokens = min(self._burst, state.tokens + (now - state.refilled_at) / self._delay_s)
+        state.refilled_at = now
+
+    def push(self, host: str, item: _ItemT) -> bool:
+        """
+        Queues `item` for `host`.
+
+        Returns:
+            bool: False, without queueing it, if the host already holds `max_ready` items.
+        """
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(tokens=self._burst, refilled_at=time.monotonic())
+            self._hosts[host] = state
+        if self._max_ready is not None and len(state.ready) >= self._max_ready:
+            return False
+        if not state.ready:
+            self._order.append(host)
+        state.ready.append((time.monotonic(), item))
+        self._pending += 1
+        return True
+
+    def pop(self) -> tuple[str, _ItemT] | None:
+        """Returns the next item from the next host allowed to run, if any."""
+        now = time.monotonic()
+        for _ in range(len(self._order)):
+            host = self._order[0]
+            self._order.rotate(-1)
+            state = self._hosts[host]
+            self._refill(state, now)
+            if state.tokens < 1 or state.active >= self._concurrency:
+                continue
+
+            state.tokens -= 1
+            state.active += 1
+            _, item = state.ready.popleft()
+            self._pending -= 1
+            if not state.ready:
+                self._order.remove(host)
+            return host, item
+        return None
+
+    def release(self, host: str) -> None:
+        state = self._hosts.get(host)
+        if state is None:
+            return
+        state.active -= 1
+        # Forget idle hosts once their bucket is full again to keep memory bounded
+        if not state.active and not state.ready:
+            self._refill(state, time.monotonic())
+            if state.tokens >= self._burst:
+                del self._hosts[host]
+
+    def next_ready_in(self) -> float:
+        """Seconds until a waiting host may get a token, 0 if one is ready now."""
+        if self._delay_s <= 0 or not self._order:
+            return 0.0
+        now = time.monotonic()
+        waits: list[float] = []
+        for host in self._order:
+            state = self._hosts[host]
+            if state.active >= self._concurrency:
+                continue
+            self._refill(state, now)
+            waits.append(max(0.0, (1 - state.tokens) * self._delay_s))
+        return min(waits, default=self._delay_s)
+
+    def expire(self, max_age_s: float) -> list[_ItemT]:
+        """Removes and returns the items that have been waiting for `max_age_s` or more."""
+        now = time.monotonic()
+        pushed_before = now - max_age_s
+        items: list[_ItemT] = []
+        for host in list(self._order):
+            state = self._hosts[host]
+            while state.ready and state.ready[0][0] <= pushed_before:
+                items.append(state.ready.popleft()[1])
+            if state.ready:
+                continue
+            self._order.remove(host)
+            self._refill(state, now)
+            if not state.active and state.tokens >= self._burst:
+                del self._hosts[host]
+        self._pending -= len(items)
+        return items
+
+    def drain(self) -> list[_ItemT]:
+        """Removes and returns every item that has not been handed out."""
+        items = [item for host in self._order for _, item in self._hosts[host].ready]
+        for host in self._order:
+            self._hosts[host].ready.clear()
+        self._order.clear()
+        self._pending = 0
+        return items
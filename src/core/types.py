@@ -241,6 +241,27 @@ class ModelType(StrEnum):
             return None
 
 
+class SeenMode(StrEnum):
+    SET = "set"  # Exact, memory grows with the number of urls
+    BLOOM = "bloom"  # Probabilistic, fixed memory for a given capacity
+
+
+class Extractor(StrEnum):
+    HTML_TO_JSON = "html_to_json"  # Headings, paragraphs, lists, tables, links and images
+    TRAFILATURA = "trafilatura"  # Main text only, boilerplate removed by trafilatura
+    TEXT = "text"  # All visible text outside navigation, no structure
+
+
+class BlobBackend(StrEnum):
+    DB = "db"  # Body kept in the `data` row
+    LOCAL = "local"  # Sharded directories on a local or mounted filesystem
+
+
+class QueueBackend(StrEnum):
+    SQL = "sql"  # Poll the task table
+    STREAM = "stream"  # Redis stream consumer group
+
+
 class Action(StrEnum):
     CREATE = "create"  # CRUD: create
     READ = "read"  # CRUD: read
@@ -503,3 +524,8 @@ class DataSubType(StrEnum):
     # Notes / annotations
     MARKDOWN = "markdown"
     NOTE = "note"
+
+    # NLP annotations of a parent page
+    ENTITIES = "entities"
+    KEYWORDS = "keywords"
+    SENTENCES = "sentences"
@@ -41,6 +41,14 @@ def init_db(app: FastAPI) -> None:
         add_exception_handlers=True,
     )
 
+async def connect_db() -> None:
+    await Tortoise.init(config=DB_CONFIG)
+
+
+async def close_db() -> None:
+    await Tortoise.close_connections()
+
+
 async def run_migrations() -> None:
     async def run_command(*args):
         process = await asyncio.create_subprocess_exec(
@@ -0,0 +1,58 @@
+from tortoise import BaseDBAsyncClient
+
+# UUID columns moved from CHAR(36) to BINARY(16), by table, with whether they are NOT NULL.
+# Existing values are kept, only their encoding changes.
+_COLUMNS: dict[str, dict[str, bool]] = {
+    "url": {"id": True},
+    "task": {"id": True, "ref": True},
+    "data": {"id": True, "parent_id": False, "url_id": False},
+}
+# Foreign keys between these columns, dropped while their two ends disagree on the type
+_FOREIGN_KEYS = """
+        ALTER TABLE `data` ADD CONSTRAINT `fk_data_data_b16099d7` FOREIGN KEY (`parent_id`) REFERENCES `data` (`id`) ON DELETE SET NULL;
+        ALTER TABLE `data` ADD CONSTRAINT `fk_data_url_3dece882` FOREIGN KEY (`url_id`) REFERENCES `url` (`id`) ON DELETE CASCADE;"""
+_DROP_FOREIGN_KEYS = """
+        ALTER TABLE `data` DROP FOREIGN KEY `fk_data_data_b16099d7`;
+        ALTER TABLE `data` DROP FOREIGN KEY `fk_data_url_3dece882`;"""
+
+
+def _modify(table: str, columns: dict[str, bool], sql_type: str) -> str:
+    changes = ", ".join(
+        f"MODIFY COLUMN `{column}` {sql_type}{' NOT NULL' if not_null else ''}" for column, not_null in columns.items()
+    )
+    return f"\n        ALTER TABLE `{table}` {changes};"
+
+
+def _convert(table: str, columns: dict[str, bool], expression: str, sql_type: str) -> str:
+    """
+    Re-encodes `columns` through a VARBINARY(36) step that can hold both encodings.
+    `updated_at` is carried over so the conversion does not reorder the frontier.
+    """
+    values = ", ".join(f"`{column}` = {expression.format(column=f'`{column}`')}" for column in columns)
+    return (
+        _modify(table, columns, "VARBINARY(36)")
+        + f"\n        UPDATE `{table}` SET {values}, `updated_at` = `updated_at`;"
+        + _modify(table, columns, sql_type)
+    )
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    expression = "UNHEX(REPLACE({column}, '-', ''))"
+    return (
+        _DROP_FOREIGN_KEYS
+        + "".join(_convert(table, columns, expression, "BINARY(16)") for table, columns in _COLUMNS.items())
+        + _FOREIGN_KEYS
+    )
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    # CONCAT rather than CONCAT_WS, which would turn NULL into an empty string
+    hex_value = "HEX({column})"
+    expression = "LOWER(CONCAT({}))".format(", '-', ".join(
+        f"SUBSTR({hex_value}, {start}, {length})" for start, length in ((1, 8), (9, 4), (13, 4), (17, 4), (21, 12))
+    ))
+    return (
+        _DROP_FOREIGN_KEYS
+        + "".join(_convert(table, columns, expression, "CHAR(36)") for table, columns in _COLUMNS.items())
+        + _FOREIGN_KEYS
+    )
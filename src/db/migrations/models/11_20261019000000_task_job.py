@@ -0,0 +1,19 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `task` ADD `job_id` BINARY(16);
+        ALTER TABLE `task` ADD INDEX `idx_task_type_b9bf66` (`type`, `job_id`, `state`, `updated_at`);
+        ALTER TABLE `task` ADD INDEX `idx_task_type_a22c04` (`type`, `job_id`, `updated_at`);
+        ALTER TABLE `task` DROP INDEX `idx_task_type_294817`;
+        ALTER TABLE `task` DROP INDEX `idx_task_type_e4082e`;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `task` ADD INDEX `idx_task_type_294817` (`type`, `state`, `updated_at`);
+        ALTER TABLE `task` ADD INDEX `idx_task_type_e4082e` (`type`, `updated_at`);
+        ALTER TABLE `task` DROP INDEX `idx_task_type_b9bf66`;
+        ALTER TABLE `task` DROP INDEX `idx_task_type_a22c04`;
+        ALTER TABLE `task` DROP COLUMN `job_id`;"""
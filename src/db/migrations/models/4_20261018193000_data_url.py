@@ -0,0 +1,17 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `data` ADD `last_seen_at` DATETIME(6);
+        ALTER TABLE `data` ADD `url_id` CHAR(36);
+        ALTER TABLE `data` ADD CONSTRAINT `fk_data_url_3dece882` FOREIGN KEY (`url_id`) REFERENCES `url` (`id`) ON DELETE CASCADE;
+        ALTER TABLE `data` ADD INDEX `idx_data_url_id_10ff89` (`url_id`, `updated_at`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `data` DROP FOREIGN KEY `fk_data_url_3dece882`;
+        ALTER TABLE `data` DROP INDEX `idx_data_url_id_10ff89`;
+        ALTER TABLE `data` DROP COLUMN `url_id`;
+        ALTER TABLE `data` DROP COLUMN `last_seen_at`;"""
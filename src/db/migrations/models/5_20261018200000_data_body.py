@@ -0,0 +1,85 @@
+import json
+
+import zstandard
+from tortoise import BaseDBAsyncClient
+
+# Rows converted per statement batch, so the backfill never holds many pages in memory
+_BATCH_SIZE = 500
+_LEVEL = 3
+
+
+async def _backfill_body(db: BaseDBAsyncClient) -> None:
+    """Moves `{"html": ...}` page content into a plain zstd frame in `body`."""
+    compressor = zstandard.ZstdCompressor(level=_LEVEL)
+    last_id = ""
+    while True:
+        _, rows = await db.execute_query(
+            "SELECT `id`, `content` FROM `data` WHERE `body` IS NULL AND `content` IS NOT NULL AND `id` > %s "
+            "ORDER BY `id` LIMIT %s",
+            [last_id, _BATCH_SIZE],
+        )
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        updates = []
+        for row in rows:
+            content = json.loads(row["content"])
+            # Anything but a stored page is left as it was
+            if isinstance(content, dict) and content.keys() == {"html"} and isinstance(content["html"], str):
+                updates.append([compressor.compress(content["html"].encode("utf-8")), row["id"]])
+        if updates:
+            await db.execute_many(
+                "UPDATE `data` SET `body` = %s, `content` = NULL, `updated_at` = `updated_at` WHERE `id` = %s",
+                updates,
+            )
+
+
+async def _restore_content(db: BaseDBAsyncClient) -> None:
+    """Inverse of `_backfill_body`, for every body including dictionary-compressed ones."""
+    _, dicts = await db.execute_query("SELECT `content` FROM `compression_dict`")
+    decompressors = {0: zstandard.ZstdDecompressor()}
+    for row in dicts:
+        dict_data = zstandard.ZstdCompressionDict(row["content"])
+        decompressors[dict_data.dict_id()] = zstandard.ZstdDecompressor(dict_data=dict_data)
+    last_id = ""
+    while True:
+        _, rows = await db.execute_query(
+            "SELECT `id`, `body` FROM `data` WHERE `body` IS NOT NULL AND `id` > %s ORDER BY `id` LIMIT %s",
+            [last_id, _BATCH_SIZE],
+        )
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        updates = []
+        for row in rows:
+            body = row["body"]
+            html = decompressors[zstandard.get_frame_parameters(body).dict_id].decompress(body).decode("utf-8")
+            updates.append([json.dumps({"html": html}), row["id"]])
+        await db.execute_many(
+            "UPDATE `data` SET `content` = %s, `body` = NULL, `updated_at` = `updated_at` WHERE `id` = %s",
+            updates,
+        )
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    await db.execute_script("ALTER TABLE `data` ADD `body` LONGBLOB;")
+    await _backfill_body(db)
+    return """
+        CREATE TABLE IF NOT EXISTS `compression_dict` (
+    `id` CHAR(36) NOT NULL PRIMARY KEY,
+    `created_at` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    `updated_at` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    `deleted_at` DATETIME(6),
+    `dict_id` BIGINT NOT NULL UNIQUE,
+    `host` VARCHAR(256) NOT NULL,
+    `content` LONGBLOB NOT NULL,
+    `samples` INT NOT NULL DEFAULT 0,
+    KEY `idx_compression_host_e8491d` (`host`)
+) CHARACTER SET utf8mb4 COMMENT='CompressionDict';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    await _restore_content(db)
+    return """
+        ALTER TABLE `data` DROP COLUMN `body`;
+        DROP TABLE IF EXISTS `compression_dict`;"""
@@ -0,0 +1,18 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `data` ADD `blob_key` VARCHAR(64);
+        ALTER TABLE `data` ADD `blob_size` BIGINT;
+        UPDATE `data` SET `blob_size` = LENGTH(`body`), `updated_at` = `updated_at` WHERE `body` IS NOT NULL;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    _, rows = await db.execute_query("SELECT COUNT(*) AS `total` FROM `data` WHERE `blob_key` IS NOT NULL")
+    if rows[0]["total"]:
+        # Dropping the reference would lose the body, which only the blob store holds
+        raise ValueError(f"{rows[0]['total']} data rows keep their body in the blob store")
+    return """
+        ALTER TABLE `data` DROP COLUMN `blob_size`;
+        ALTER TABLE `data` DROP COLUMN `blob_key`;"""
@@ -0,0 +1,12 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `data` MODIFY COLUMN `subtype` VARCHAR(13) COMMENT 'INVOICE: invoice\nREPORT: report\nARTICLE: article\nMANUAL: manual\nCONTRACT: contract\nMEMO: memo\nPRESENTATION: presentation\nSPREADSHEET: spreadsheet\nPHOTO: photo\nDIAGRAM: diagram\nSCREENSHOT: screenshot\nICON: icon\nLOGO: logo\nMAP: map\nTUTORIAL: tutorial\nADVERTISEMENT: advertisement\nCLIP: clip\nMOVIE: movie\nANIMATION: animation\nMUSIC: music\nPODCAST: podcast\nRECORDING: recording\nSOUND_EFFECT: sound_effect\nTEMPERATURE: temperature\nHUMIDITY: humidity\nGPS: gps\nACCELERATION: acceleration\nPRESSURE: pressure\nLIGHT: light\nPROXIMITY: proximity\nERROR_LOG: error_log\nACCESS_LOG: access_log\nEVENT_LOG: event_log\nPAYMENT: payment\nORDER: order\nREFUND: refund\nINVOICE_ITEM: invoice_item\nHTML_PAGE: html_page\nJSON_RESPONSE: json_response\nXML_RESPONSE: xml_response\nPYTHON: python\nSHELL: shell\nJAVASCRIPT: javascript\nSQL: sql\nMODEL_FILE: model_file\nTRAINING_DATA: training_data\nMARKDOWN: markdown\nNOTE: note\nENTITIES: entities\nKEYWORDS: keywords\nSENTENCES: sentences';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DELETE FROM `data` WHERE `subtype` IN ('entities', 'keywords', 'sentences');
+        ALTER TABLE `data` MODIFY COLUMN `subtype` VARCHAR(13) COMMENT 'INVOICE: invoice\nREPORT: report\nARTICLE: article\nMANUAL: manual\nCONTRACT: contract\nMEMO: memo\nPRESENTATION: presentation\nSPREADSHEET: spreadsheet\nPHOTO: photo\nDIAGRAM: diagram\nSCREENSHOT: screenshot\nICON: icon\nLOGO: logo\nMAP: map\nTUTORIAL: tutorial\nADVERTISEMENT: advertisement\nCLIP: clip\nMOVIE: movie\nANIMATION: animation\nMUSIC: music\nPODCAST: podcast\nRECORDING: recording\nSOUND_EFFECT: sound_effect\nTEMPERATURE: temperature\nHUMIDITY: humidity\nGPS: gps\nACCELERATION: acceleration\nPRESSURE: pressure\nLIGHT: light\nPROXIMITY: proximity\nERROR_LOG: error_log\nACCESS_LOG: access_log\nEVENT_LOG: event_log\nPAYMENT: payment\nORDER: order\nREFUND: refund\nINVOICE_ITEM: invoice_item\nHTML_PAGE: html_page\nJSON_RESPONSE: json_response\nXML_RESPONSE: xml_response\nPYTHON: python\nSHELL: shell\nJAVASCRIPT: javascript\nSQL: sql\nMODEL_FILE: model_file\nTRAINING_DATA: training_data\nMARKDOWN: markdown\nNOTE: note';"""
@@ -0,0 +1,13 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `task` ADD INDEX `idx_task_type_294817` (`type`, `state`, `updated_at`);
+        ALTER TABLE `task` ADD INDEX `idx_task_type_e4082e` (`type`, `updated_at`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `task` DROP INDEX `idx_task_type_e4082e`;
+        ALTER TABLE `task` DROP INDEX `idx_task_type_294817`;"""
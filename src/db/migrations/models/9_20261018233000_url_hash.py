@@ -0,0 +1,40 @@
+import hashlib
+
+from tortoise import BaseDBAsyncClient
+
+# Rows hashed per statement batch
+_BATCH_SIZE = 500
+_HASH_SIZE = 16
+
+
+async def _backfill_url_hash(db: BaseDBAsyncClient) -> None:
+    """Fills `url_hash` with the first 16 bytes of the SHA-256 of `url`."""
+    last_id = ""
+    while True:
+        _, rows = await db.execute_query(
+            "SELECT `id`, `url` FROM `url` WHERE `url_hash` IS NULL AND `id` > %s ORDER BY `id` LIMIT %s",
+            [last_id, _BATCH_SIZE],
+        )
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        await db.execute_many(
+            "UPDATE `url` SET `url_hash` = %s, `updated_at` = `updated_at` WHERE `id` = %s",
+            [[hashlib.sha256(row["url"].encode("utf-8")).digest()[:_HASH_SIZE], row["id"]] for row in rows],
+        )
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    await db.execute_script("ALTER TABLE `url` ADD `url_hash` BINARY(16);")
+    await _backfill_url_hash(db)
+    return """
+        ALTER TABLE `url` MODIFY COLUMN `url_hash` BINARY(16) NOT NULL;
+        ALTER TABLE `url` ADD UNIQUE INDEX `url_hash` (`url_hash`);
+        ALTER TABLE `url` DROP INDEX `url`;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `url` ADD UNIQUE INDEX `url` (`url`);
+        ALTER TABLE `url` DROP INDEX `url_hash`;
+        ALTER TABLE `url` DROP COLUMN `url_hash`;"""
@@ -1,3 +1,4 @@
+from .compression_dict import CompressionDict
 from .data import Data
 from .task import Task
 from .url import Url
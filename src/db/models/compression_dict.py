@@ -0,0 +1,19 @@
+from tortoise import fields
+
+from src.core.base import Base
+
+
+class CompressionDict(Base):
+    # zstd dictionary id, as written in the header of every frame compressed with it
+    dict_id: int = fields.BigIntField(unique=True)
+    host: str = fields.CharField(max_length=256, index=True)
+    content: bytes = fields.BinaryField()
+    samples: int = fields.IntField(default=0)
+
+    class Meta:
+        ordering = ["host", "-created_at"]
+        table = "compression_dict"
+        table_description = "CompressionDict"
+
+    def __str__(self) -> str:
+        return f"[CompressionDict: host - {self.host}, dict_id - {self.dict_id}, samples - {self.samples}]"
@@ -1,15 +1,20 @@
 import uuid
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from tortoise import fields
 
 from src.core import common
 from src.core.base import Base
 from src.core.types import DataSource, DataStatus, DataSubType, DataType, DataVisibility
+from src.db.db_fields import BinaryUUIDField
+
+if TYPE_CHECKING:
+    from .url import Url
 
 
 class Data(Base):
+    id: uuid.UUID = BinaryUUIDField(primary_key=True)
     # identity & linkage
     source: DataSource | None = fields.CharEnumField(
         DataSource, null=True
@@ -20,6 +25,12 @@ class Data(Base):
         on_delete=fields.SET_NULL,
         null=True,
     )
+    url: fields.ForeignKeyNullableRelation["Url"] = fields.ForeignKeyField(
+        model_name="models.Url",
+        related_name="data",
+        on_delete=fields.CASCADE,
+        null=True,
+    )
     # classification
     type: DataType | None = fields.CharEnumField(
         DataType, null=True, default=None
@@ -42,6 +53,12 @@ class Data(Base):
 
     # core
     content: dict[str, Any] | list[Any] | None = fields.JSONField(null=True, default=None)
+    # page body as a zstd frame, read and written through DataRepo
+    body: bytes | None = fields.BinaryField(null=True)
+    # set instead of `body` when the body is in the blob store, keyed by `checksum`
+    blob_key: str | None = fields.CharField(max_length=64, null=True)
+    # stored (compressed) size of the body, wherever it is
+    blob_size: int | None = fields.BigIntField(null=True)
     checksum: str | None = fields.CharField(max_length=64, null=True, index=True)
 
     # quality
@@ -54,6 +71,8 @@ class Data(Base):
 
     # expiration
     expires_at: datetime | None = fields.DatetimeField(null=True)
+    # last crawl that returned this exact content
+    last_seen_at: datetime | None = fields.DatetimeField(null=True)
 
     meta: dict[str, Any] | list[Any] | None = fields.JSONField(null=True, default=None)
 
@@ -61,6 +80,7 @@ class Data(Base):
         ordering = ["source", "type", "subtype"]
         table = "data"
         table_description = "Data"
+        indexes = (("url_id", "updated_at"),)
 
     def __str__(self) -> str:
         return f"[Data: {self.source}, {self.type}, {self.subtype}, {self.status}]"
@@ -6,11 +6,13 @@ from tortoise import fields
 
 from src.core.base import Base
 from src.core.types import Action, State
+from src.db.db_fields import BinaryUUIDField
 
 
 class Task(Base):
+    id: uuid.UUID = BinaryUUIDField(primary_key=True)
     type: str = fields.CharField(max_length=32)
-    ref: uuid.UUID = fields.UUIDField()
+    ref: uuid.UUID = BinaryUUIDField()
 
     state: State = fields.CharEnumField(
         State,
@@ -23,10 +25,16 @@ class Task(Base):
         default=None,
     )
     meta: dict[str, Any] | list[None] | None = fields.JSONField(null=True, default=None)
+    # Crawl run the task belongs to; runs only claim their own tasks, the standalone
+    # worker only untagged ones
+    job_id: uuid.UUID | None = BinaryUUIDField(null=True)
 
     class Meta:
         ordering = ["type", "ref"]
         unique_together = [("type", "ref")]
+        # Frontier picks of one run (or the untagged frontier): by state oldest first,
+        # and expired tasks oldest first
+        indexes = (("type", "job_id", "state", "updated_at"), ("type", "job_id", "updated_at"))
         table = "task"
         table_description = "Task"
 
@@ -1,17 +1,22 @@
+import uuid
 from typing import Any
 
 from tortoise import fields
 
 from src.core.base import Base
+from src.core.constants import URL_HASH_SIZE
+from src.db.db_fields import BinaryUUIDField, FixedBinaryField
 from src.db.validators import UrlValidator
 
 
 class Url(Base):
+    id: uuid.UUID = BinaryUUIDField(primary_key=True)
     url: str = fields.CharField(
         max_length=2048,
-        unique=True,
         validators=[UrlValidator()]
     )
+    # Unique lookup key, so the index stays 16 bytes wide however long urls get
+    url_hash: bytes = FixedBinaryField(length=URL_HASH_SIZE, unique=True)
     base_url: str = fields.CharField(
         max_length=2048,
         validators=[UrlValidator()]
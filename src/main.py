@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.core.clients import create_parse_executor
 from src.core.common import get_app_version
 from src.core.config import settings
 from src.core.error import config_global_errors
@@ -16,6 +17,7 @@ async def lifespan(fa: FastAPI):
     await run_migrations()
     yield  # startup complete
     # any shutdown code here
+    await create_parse_executor().close()
 
 
 app = FastAPI(
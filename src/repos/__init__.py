@@ -1,5 +1,9 @@
 from collections.abc import AsyncGenerator
 
+from src.core.clients import create_blob_store
+from src.core.compression import HtmlCodec
+from src.core.config import settings
+
 from .data import DataRepo
 from .task import TaskRepo
 from .url import UrlRepo
@@ -11,5 +15,8 @@ async def get_task_repo() -> AsyncGenerator[TaskRepo]:
 async def get_url_repo() -> AsyncGenerator[UrlRepo]:
     yield UrlRepo()
 
+def create_data_repo() -> DataRepo:
+    return DataRepo(HtmlCodec(level=settings.data_compression_level), create_blob_store())
+
 async def get_data_repo() -> AsyncGenerator[DataRepo]:
-    yield DataRepo()
\ No newline at end of file
+    yield create_data_repo()
\ No newline at end of file
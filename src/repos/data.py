@@ -1,27 +1,259 @@
+import time
+import uuid
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+from loguru import logger
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from src.core import common
 from src.core.base import BaseRepo
-from src.db.models import Data, Url
+from src.core.clients import BlobStore
+from src.core.compression import HtmlCodec
+from src.core.constants import DATA_DICT_REFRESH_S
+from src.core.formats import CanonicalUrl
+from src.core.types import DataSubType
+from src.db.models import CompressionDict, Data, Url
+
+
+async def _prepend(head: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield head
+    async for chunk in chunks:
+        yield chunk
 
 
 class DataRepo(BaseRepo[Data]):
-    def __init__(self) -> None:
+    """
+    Page bodies are stored zstd-compressed, in the blob store when one is configured and
+    in `body` otherwise; callers pass and get back plain html (`create_or_update`,
+    `get_html`, `stream_html`). Rows written before compression keep the page in
+    `content` and are still readable.
+    """
+
+    _codec: HtmlCodec
+    _blob_store: BlobStore | None
+
+    def __init__(self, codec: HtmlCodec | None = None, blob_store: BlobStore | None = None) -> None:
         super().__init__(Data)
+        self._codec = codec or HtmlCodec()
+        self._blob_store = blob_store
+
+    async def touch(self, data_id: uuid.UUID) -> int:
+        """
+        Marks a row as seen now without rewriting it. `updated_at` is kept so it still
+        tells when the content last changed.
+        """
+        return await self._model.filter(id=data_id).update(
+            last_seen_at=datetime.now(UTC), updated_at=F("updated_at")
+        )
+
+    async def load_dictionaries(self, force: bool = False) -> int:
+        """
+        Registers the stored compression dictionaries with the codec, at most once per
+        `DATA_DICT_REFRESH_S` unless `force`. The newest dictionary of a host is the one
+        new bodies are compressed with; older ones stay registered for reading.
+
+        Returns:
+            int: Number of dictionaries loaded, 0 when the loaded ones are still fresh.
+        """
+        loaded_at = self._codec.loaded_at
+        if not force and loaded_at is not None and time.monotonic() - loaded_at < DATA_DICT_REFRESH_S:
+            return 0
+        rows = await CompressionDict.all().order_by("created_at").values("dict_id", "host", "content")
+        for row in rows:
+            self._codec.register(row["dict_id"], row["content"], hosts=(row["host"],))
+        self._codec.mark_loaded()
+        if rows:
+            logger.info(f"{self._tag}|load_dictionaries(): Loaded {len(rows)} dictionaries")
+        return len(rows)
+
+    async def add_dictionary(self, host: str, content: bytes, samples: int) -> CompressionDict:
+        dict_id = HtmlCodec.dictionary_id(content)
+        obj = await CompressionDict.create(dict_id=dict_id, host=host, content=content, samples=samples)
+        self._codec.register(dict_id, content, hosts=(host,))
+        return obj
+
+    async def _body_chunks(self, data: Data) -> AsyncIterator[bytes]:
+        if data.blob_key is not None:
+            if self._blob_store is None:
+                raise FileNotFoundError(f"Blob {data.blob_key} of {data} needs a blob store")
+            async for chunk in self._blob_store.stream(data.blob_key):
+                yield chunk
+        elif data.body is not None:
+            yield data.body
+
+    async def stream_html(self, data: Data) -> AsyncIterator[str]:
+        """
+        The page html of a row in pieces, whichever way it was stored. Blob-stored
+        bodies are decompressed as they are read from the store.
+
+        Raises:
+            KeyError: If the body was compressed with a dictionary that no longer exists.
+            FileNotFoundError: If the row points at a blob that is not in the store.
+        """
+        if data.blob_key is None and data.body is None:
+            if isinstance(data.content, dict) and isinstance(data.content.get("html"), str):
+                yield data.content["html"]
+            return
+        chunks = self._body_chunks(data)
+        head = await anext(chunks, None)
+        if head is None:
+            return
+        if not self._codec.has_dict(HtmlCodec.frame_dict_id(head)):
+            # Trained by another process since this one last loaded them
+            await self.load_dictionaries(force=True)
+        async for text in self._codec.decompress_stream(_prepend(head, chunks)):
+            yield text
+
+    async def get_html(self, data: Data) -> str | None:
+        """`stream_html` joined, or None when the row holds no page."""
+        pieces = [text async for text in self.stream_html(data)]
+        return "".join(pieces) if pieces else None
+
+    async def _store_body(self, checksum: str, body: bytes, replace: bool = False) -> dict[str, Any]:
+        """Columns that reference `body`, written to the blob store when there is one."""
+        if self._blob_store is None:
+            return {"content": None, "body": body, "blob_key": None, "blob_size": len(body)}
+        size = await self._blob_store.put(checksum, body, replace=replace)
+        return {"content": None, "body": None, "blob_key": checksum, "blob_size": size}
+
+    async def sample_html(self, base_url: str, limit: int) -> list[str]:
+        """Latest stored pages of one site, as dictionary training samples."""
+        rows = await self._model.filter(url__base_url=base_url).order_by("-updated_at").limit(limit)
+        return [html for html in [await self.get_html(row) for row in rows] if html]
+
+    async def recompress(self, base_url: str, batch_size: int = 500) -> int:
+        """
+        Rewrites the bodies of one site that are not compressed with its current
+        dictionary, keeping `updated_at`.
+
+        Returns:
+            int: Number of rows rewritten.
+        """
+        await self.load_dictionaries(force=True)
+        host = CanonicalUrl.parse(base_url).host
+        dict_id = self._codec.host_dict_id(host)
+        total = 0
+        async for rows in self.iter_batches(url__base_url=base_url, batch_size=batch_size):
+            for row in rows:
+                body = b"".join([chunk async for chunk in self._body_chunks(row)])
+                if body and HtmlCodec.frame_dict_id(body) == dict_id:
+                    continue
+                html = await self.get_html(row)
+                if html is None or row.checksum is None:
+                    continue
+                # The blob keeps its key: it is the same page, only encoded differently
+                stored = await self._store_body(row.checksum, self._codec.compress(html, host=host), replace=True)
+                await self._model.filter(id=row.id).update(**stored, updated_at=F("updated_at"))
+                total += 1
+        return total
+
+    async def offload_bodies(self, batch_size: int = 500) -> int:
+        """
+        Moves bodies kept in rows into the blob store, keeping `updated_at`.
+
+        Returns:
+            int: Number of rows moved.
+        """
+        if self._blob_store is None:
+            raise ValueError("No blob store configured")
+        total = 0
+        while True:
+            # Moved rows drop out of the filter, so the first batch is always the next one
+            rows = await (
+                self._model.filter(body__isnull=False, checksum__isnull=False)
+                .order_by("id")
+                .limit(batch_size)
+                .values("id", "checksum", "body")
+            )
+            if not rows:
+                return total
+            for row in rows:
+                stored = await self._store_body(row["checksum"], row["body"])
+                await self._model.filter(id=row["id"]).update(**stored, updated_at=F("updated_at"))
+            total += len(rows)
+            logger.info(f"{self._tag}|offload_bodies(): Moved {total} bodies")
+
+    async def iter_blob_keys(self, batch_size: int = 10_000) -> AsyncIterator[list[str]]:
+        async for rows in self.iter_batches(blob_key__isnull=False, batch_size=batch_size, values=["blob_key"]):
+            yield [row["blob_key"] for row in rows]
+
+    def iter_pages(self, batch_size: int = 1000) -> AsyncIterator[list[dict[str, Any]]]:
+        """`id` and `checksum` of every crawled page row, in batches."""
+        return self.iter_batches(
+            url_id__isnull=False, parent_id__isnull=True, batch_size=batch_size, values=["checksum"]
+        )
+
+    async def children_meta(self, parent_ids: list[uuid.UUID], subtype: DataSubType) -> dict[uuid.UUID, Any]:
+        """`meta` of the `subtype` child of each parent that has one."""
+        rows = await self._model.filter(parent_id__in=parent_ids, subtype=subtype).values("parent_id", "meta")
+        return {row["parent_id"]: row["meta"] for row in rows}
+
+    async def replace_children(
+        self, parent_ids: list[uuid.UUID], subtypes: list[DataSubType], children: list[dict[str, Any]]
+    ) -> int:
+        """
+        Swaps the `subtypes` children of the parents for `children` in one transaction,
+        so readers see either the old set or the new one.
+
+        Returns:
+            int: Number of children created.
+        """
+        instances = [
+            self._model(**child, checksum=common.compute_checksum(child["content"])) for child in children
+        ]
+        async with in_transaction() as connection:
+            await self._model.filter(parent_id__in=parent_ids, subtype__in=subtypes).using_db(connection).delete()
+            await self._model.bulk_create(instances, batch_size=500, using_db=connection)
+        return len(instances)
 
     async def create_or_update(
-        self, url: Url, content: str, **kwargs: Any
-    ) -> Data:
-        latest_raw = await self._model.filter(url=url).order_by("-updated_at").first()
+        self, url: Url, content: str, refresh_meta: bool = False, **kwargs: Any
+    ) -> Data | None:
+        """
+        Stores the page content for `url`, skipping the write when it is byte-identical
+        to the latest stored row. With `refresh_meta`, an identical row still gets the
+        new `kwargs` (e.g. `meta` from another extractor) and keeps its `updated_at`.
+
+        Returns:
+            Data | None: The written row, or None when only `last_seen_at` was touched.
+        """
+        # Only the columns needed to decide, so unchanged pages never read the content back
+        latest_raw = await (
+            self._model.filter(url=url)
+            .order_by("-updated_at")
+            .first()
+            .values("id", "checksum", "updated_at")
+        )
+        # Same checksum as when the page was stored in the `content` JSON column
+        checksum = common.compute_checksum({"html": content})
+
+        if latest_raw and latest_raw["checksum"] == checksum:
+            if not refresh_meta:
+                await self.touch(latest_raw["id"])
+                return None
+            await self._model.filter(id=latest_raw["id"]).update(
+                last_seen_at=datetime.now(UTC), updated_at=F("updated_at"), **kwargs
+            )
+            return await self._model.get(id=latest_raw["id"])
+
+        await self.load_dictionaries()
+        stored = await self._store_body(checksum, self._codec.compress(content, host=CanonicalUrl.parse(url.url).host))
 
         if latest_raw:
-            time_diff = datetime.now(UTC) - latest_raw.updated_at.astimezone(UTC)
+            time_diff = datetime.now(UTC) - latest_raw["updated_at"].astimezone(UTC)
             if time_diff >= timedelta(weeks=1):
-                latest_raw.content = content
-                for attr, value in kwargs.items():
-                    setattr(latest_raw, attr, value)
-                await latest_raw.save()
-                return latest_raw
+                await self._model.filter(id=latest_raw["id"]).update(
+                    **stored,
+                    checksum=checksum,
+                    last_seen_at=datetime.now(UTC),
+                    **kwargs,
+                )
+                return await self._model.get(id=latest_raw["id"])
 
         # Create new raw if no recent record found or latest is recent
-        return await self._model.create(url=url, content=content, **kwargs)
+        return await self._model.create(
+            url=url, **stored, checksum=checksum, last_seen_at=datetime.now(UTC), **kwargs
+        )
@@ -3,9 +3,12 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from loguru import logger
+from tortoise.expressions import F
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
 
 from src.core.base import BaseRepo
-from src.core.types import ModelType, State
+from src.core.types import Action, ModelType, State
 from src.db.models import Task
 
 
@@ -21,7 +24,7 @@ class TaskRepo(BaseRepo[Task]):
         **kwargs: Any
     ) -> Task:
         obj, created = await self._model.get_or_create(
-            ref=ref, ref_type=ref_type, defaults=defaults or {}
+            ref=ref, type=ref_type, defaults=defaults or {}
         )
         if not created and kwargs:
             for attr, value in kwargs.items():
@@ -29,26 +32,200 @@ class TaskRepo(BaseRepo[Task]):
             await obj.save()
         return obj
 
+    def frontier_query(self, ref_type: ModelType, state: State, **kwargs: Any) -> QuerySet[Task]:
+        """
+        Tasks of `ref_type` in `state`, oldest first. Filtered on `job_id` (None for the
+        untagged frontier), it reads the (type, job_id, state, updated_at) index in order,
+        so picking from the front never sorts.
+        """
+        return self._model.filter(type=ref_type, state=state, **kwargs).order_by("updated_at")
+
+    def expired_query(self, ref_type: ModelType, expire_after_s: int, **kwargs: Any) -> QuerySet[Task]:
+        """
+        Tasks of `ref_type` not updated for `expire_after_s` seconds, oldest first.
+        Filtered on `job_id`, a range scan of the (type, job_id, updated_at) index.
+        """
+        expire_threshold = datetime.now(UTC) - timedelta(seconds=expire_after_s)
+        return self._model.filter(type=ref_type, updated_at__lt=expire_threshold, **kwargs).order_by("updated_at")
+
     async def get_first_by_states(
-        self, ref_type: ModelType, states: list[State]) -> Task | None:
-        return await self.first(
-            ref_type=ref_type,
-            state__in=states,
-            sort="updated_at"
-        )
+        self, ref_type: ModelType, states: list[State], job_id: uuid.UUID | None = None) -> Task | None:
+        # One indexed pick per state: rows matching `state IN (...)` come out of the index
+        # grouped by state, not by updated_at, and would need a sort
+        tasks = [await self.frontier_query(ref_type, state, job_id=job_id).first() for state in states]
+        return min((task for task in tasks if task), key=lambda task: task.updated_at, default=None)
 
     async def get_first_expired(
         self,
         ref_type: ModelType,
         expire_after_s: int,
+        job_id: uuid.UUID | None = None,
     ) -> Task | None:
-        expire_threshold = datetime.now(UTC) - timedelta(seconds=expire_after_s)
-        return await self.first(
-            ref_type=ref_type,
-            updated_at__lt=expire_threshold,
-            sort="updated_at"
+        return await self.expired_query(ref_type, expire_after_s, job_id=job_id).first()
+
+    async def claim_next(
+        self,
+        batch_size: int,
+        ref_type: ModelType = ModelType.URL,
+        states: list[State] | None = None,
+        expire_after_s: int | None = None,
+        action: Action = Action.CRAWL,
+        ids: list[uuid.UUID] | None = None,
+        job_id: uuid.UUID | None = None,
+    ) -> list[Task]:
+        """
+        Atomically claims up to `batch_size` tasks and marks them RUNNING.
+
+        Candidate rows are locked with `SELECT ... FOR UPDATE SKIP LOCKED` and updated
+        in the same transaction, so concurrent claimers (workers, processes or nodes)
+        always receive disjoint batches instead of queueing on the same rows.
+
+        Every task of the batch gets the same `updated_at`, the claim time. It is the
+        claim token that `transition` can require, since any later claim of the task
+        replaces it.
+
+        Parameters:
+            batch_size (int): Maximum number of tasks to claim.
+            ref_type (ModelType): Type of the referenced model.
+            states (list[State] | None): Claimable states, NEW by default.
+            expire_after_s (int | None): If set, fill remaining slots with tasks
+                not updated for this many seconds (recrawls and stale claims).
+            action (Action): Action recorded on the claimed tasks.
+            ids (list[uuid.UUID] | None): Restrict the claim to these task ids.
+            job_id (uuid.UUID | None): Crawl run claiming. Without `ids`, only its own
+                tasks are claimed, or only untagged ones if None. Claimed tasks are
+                tagged with it, which is how a run adopts its seeds.
+
+        Returns:
+            list[Task]: The claimed tasks, oldest first.
+        """
+        states = states or [State.NEW]
+        scope: dict[str, Any] = {"id__in": ids} if ids else {"job_id": job_id}
+
+        async with in_transaction() as connection:
+            # Per state for the same reason as `get_first_by_states`; rows locked past the
+            # batch are released at commit
+            tasks: list[Task] = []
+            for state in states:
+                tasks += await (
+                    self.frontier_query(ref_type, state, **scope)
+                    .limit(batch_size)
+                    .select_for_update(skip_locked=True)
+                    .using_db(connection)
+                )
+            tasks = sorted(tasks, key=lambda task: task.updated_at)[:batch_size]
+
+            if expire_after_s is not None and len(tasks) < batch_size:
+                query = self.expired_query(ref_type, expire_after_s, **scope)
+                if tasks:
+                    query = query.exclude(id__in=[task.id for task in tasks])
+                tasks += await (
+                    query.limit(batch_size - len(tasks))
+                    .select_for_update(skip_locked=True)
+                    .using_db(connection)
+                )
+
+            claimed_at = datetime.now(UTC)
+            if tasks:
+                await self._model.filter(
+                    id__in=[task.id for task in tasks]
+                ).using_db(connection).update(
+                    state=State.RUNNING, action=action, job_id=job_id, updated_at=claimed_at
+                )
+
+        for task in tasks:
+            task.state = State.RUNNING
+            task.action = action
+            task.job_id = job_id
+            task.updated_at = claimed_at
+
+        logger.debug(f"{self._tag}|claim_next(): Claimed {len(tasks)} tasks")
+        return tasks
+
+    async def create_new(
+        self,
+        refs: list[uuid.UUID],
+        ref_type: ModelType,
+        state: State = State.NEW,
+        batch_size: int = 500,
+        meta: dict[str, Any] | None = None,
+        job_id: uuid.UUID | None = None,
+    ) -> list[uuid.UUID]:
+        """
+        Bulk inserts one task per ref, skipping refs that already have a task.
+        `meta` and `job_id` are stored on every new task.
+
+        Returns:
+            list[uuid.UUID]: Ids of the newly created tasks.
+        """
+        return await self.bulk_create_new(
+            [{"ref": ref, "type": ref_type, "state": state, "meta": meta, "job_id": job_id} for ref in refs],
+            batch_size=batch_size,
         )
 
+    async def clear_job(self, job_id: uuid.UUID, ref_type: ModelType = ModelType.URL) -> int:
+        """
+        Hands the tasks of a finished crawl run over to the untagged frontier, where the
+        standalone worker crawls what the run left and recrawls the rest once expired.
+        Tasks of a run whose process died stay tagged until this is called for it.
+
+        Returns:
+            int: Number of tasks untagged.
+        """
+        # `updated_at` is kept, it orders the frontier and dates the last crawl
+        return await self._model.filter(type=ref_type, job_id=job_id).update(job_id=None, updated_at=F("updated_at"))
+
+    async def update_states(
+        self, task_ids: list[uuid.UUID], state: State, action: Action | None = None
+    ) -> int:
+        fields: dict[str, Any] = {"state": state}
+        if action:
+            fields["action"] = action
+        return await self._model.filter(id__in=task_ids).update(**fields)
+
+    async def transition(
+        self,
+        ids: list[uuid.UUID],
+        from_states: list[State],
+        to_state: State,
+        action: Action | None = None,
+        claimed_at: datetime | None = None,
+    ) -> int:
+        """
+        Moves the tasks in `ids` that are in one of `from_states` to `to_state`, in a
+        single `UPDATE ... WHERE id IN (...) AND state IN (...)` without loading them.
+
+        Tasks in any other state are left as they are. The state alone does not tell
+        claims apart, since an expired RUNNING task is claimed again as RUNNING; pass the
+        `updated_at` that `claim_next` gave the tasks as `claimed_at` so that a worker
+        whose claim has since been taken over cannot overwrite the newer one.
+
+        Parameters:
+            ids (list[uuid.UUID]): Tasks to move.
+            from_states (list[State]): States a task must be in to be moved.
+            to_state (State): New state.
+            action (Action | None): If set, recorded on the moved tasks.
+            claimed_at (datetime | None): If set, only tasks still holding this claim
+                are moved.
+
+        Returns:
+            int: Number of tasks moved.
+        """
+        if not ids:
+            return 0
+        fields: dict[str, Any] = {"state": to_state}
+        if action:
+            fields["action"] = action
+        query = self._model.filter(id__in=ids, state__in=from_states)
+        if claimed_at is not None:
+            query = query.filter(updated_at=claimed_at)
+        moved = await query.update(**fields)
+        if moved < len(ids):
+            logger.debug(
+                f"{self._tag}|transition(): Moved {moved}/{len(ids)} tasks from {', '.join(from_states)} to {to_state}"
+            )
+        return moved
+
     async def update_by_id(self, task_id: uuid.UUID, **kwargs: Any) -> Task | None:
         obj = await self.get_by_pk(task_id)
         if not obj:
@@ -1,9 +1,12 @@
+import uuid
+from collections.abc import AsyncGenerator, Mapping
 from typing import Any
 
 from pydantic import HttpUrl
-from tortoise.exceptions import DoesNotExist
+from tortoise.exceptions import IntegrityError
 
 from src.core.base import BaseRepo
+from src.core.common import compute_url_hash
 from src.db.models import Url
 
 
@@ -11,28 +14,105 @@ class UrlRepo(BaseRepo[Url]):
     def __init__(self) -> None:
         super().__init__(Url)
 
+    async def get_by_url(self, url: str) -> Url | None:
+        """Looks a canonical url up through its fixed-width hash, never the url column."""
+        return await self._model.get_or_none(url_hash=compute_url_hash(url))
+
+    async def get_by_urls(self, urls: list[str]) -> dict[str, Url]:
+        """
+        Batched `get_by_url`.
+
+        Returns:
+            dict[str, Url]: Stored rows by url, for the urls that exist.
+        """
+        if not urls:
+            return {}
+        objs = await self._model.filter(url_hash__in=[compute_url_hash(url) for url in urls])
+        return {obj.url: obj for obj in objs}
+
     async def get_or_create(
         self,
         url: HttpUrl,
         base_url: HttpUrl | None = None,
         **kwargs: Any
     ) -> tuple[Url, bool]:
-        try:
-            obj = await self._model.get(url=url)
+        obj = await self.get_by_url(str(url))
+        if obj:
             return obj, False
-        except DoesNotExist:
-            obj = await self._model.create(url=url, base_url=base_url, **kwargs)
+        obj = await self._model.create(url=url, url_hash=compute_url_hash(str(url)), base_url=base_url, **kwargs)
+        return obj, True
+
+    async def update_meta(self, url: Url, title: str | None = None, **fields: Any) -> bool:
+        """
+        Merges `fields` into `url.meta` and sets `title`, writing only the columns that
+        changed.
+
+        Returns:
+            bool: True if the row was updated.
+        """
+        meta = dict(url.meta) if isinstance(url.meta, dict) else {}
+        updates: dict[str, Any] = {}
+        merged = {**meta, **fields}
+        if merged != meta:
+            updates["meta"] = merged
+        if title and title[:256] != url.title:
+            updates["title"] = title[:256]
+        if not updates:
+            return False
+        await self._model.filter(id=url.pk).update(**updates)
+        for attr, value in updates.items():
+            setattr(url, attr, value)
+        return True
+
+    async def create_or_get(
+        self,
+        url: HttpUrl,
+        base_url: HttpUrl | None = None,
+        **kwargs: Any
+    ) -> tuple[Url, bool]:
+        # Insert first for urls known to be new, skipping the lookup
+        url_hash = compute_url_hash(str(url))
+        try:
+            obj = await self._model.create(url=url, url_hash=url_hash, base_url=base_url, **kwargs)
             return obj, True
+        except IntegrityError:
+            obj = await self._model.get(url_hash=url_hash)
+            return obj, False
 
     async def create_or_update(
         self, url: str, base_url: str | None,
         defaults: dict = None, **kwargs: Any
     ) -> Url:
         url_obj, created = await self._model.get_or_create(
-            url=url, base_url=base_url, defaults=defaults or {}
+            url_hash=compute_url_hash(url), defaults={"url": url, "base_url": base_url, **(defaults or {})}
         )
         if not created and kwargs:
             for attr, value in kwargs.items():
                 setattr(url_obj, attr, value)
             await url_obj.save()
         return url_obj
+
+    async def create_new(
+        self, urls: Mapping[str, str], batch_size: int = 500
+    ) -> list[uuid.UUID]:
+        """
+        Bulk inserts normalized urls, skipping the ones already stored.
+
+        Parameters:
+            urls (Mapping[str, str]): Normalized url mapped to its base url.
+            batch_size (int): Rows per multi-row insert statement.
+
+        Returns:
+            list[uuid.UUID]: Ids of the newly created urls.
+        """
+        return await self.bulk_create_new(
+            [
+                {"url": url, "url_hash": compute_url_hash(url), "base_url": base_url}
+                for url, base_url in urls.items()
+            ],
+            batch_size=batch_size,
+        )
+
+    async def iter_urls(self, batch_size: int = 10_000) -> AsyncGenerator[list[str]]:
+        async for rows in self.iter_batches(batch_size=batch_size, values=["url"]):
+            yield [row["url"] for row in rows]
@@ -1,11 +1,14 @@
+import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Path, Query
 from fastapi.responses import JSONResponse
 from pydantic import Field, HttpUrl
 
+from src.core.error import Error
 from src.core.success import Success
-from src.services import get_crawl_service
+from src.schemas.crawl import CrawlJobRequest
+from src.services import CrawlJobService, get_crawl_job_service, get_crawl_service
 from src.services.crawl import CrawlService
 
 router = APIRouter(prefix="/crawl", tags=["crawl"])
@@ -16,8 +19,35 @@ async def crawl(
     url: Annotated[HttpUrl, Query(...)],
     service: Annotated[CrawlService, Depends(get_crawl_service)],
     bt: Annotated[BackgroundTasks, Field(...)],
+    workers: Annotated[int | None, Query(ge=1, le=64)] = None,
 ) -> JSONResponse:
-    bt.add_task(service.crawl, url)
+    bt.add_task(service.crawl, url, workers)
     return Success.ok(
         message=f"Crawling in background for {url}"
     ).to_resp()
+
+
+@router.post(path="/jobs")
+async def create_job(
+    request: Annotated[CrawlJobRequest, Body(...)],
+    service: Annotated[CrawlService, Depends(get_crawl_service)],
+    job_service: Annotated[CrawlJobService, Depends(get_crawl_job_service)],
+    bt: Annotated[BackgroundTasks, Field(...)],
+) -> JSONResponse:
+    job = await job_service.create(request)
+    bt.add_task(service.crawl_job, job)
+    return Success.created(
+        message=f"Crawl job {job.id} queued for {len(job.seeds)} seeds",
+        data=job,
+    ).to_resp()
+
+
+@router.get(path="/jobs/{job_id}")
+async def get_job(
+    job_id: Annotated[uuid.UUID, Path(...)],
+    job_service: Annotated[CrawlJobService, Depends(get_crawl_job_service)],
+) -> JSONResponse:
+    job = await job_service.get(job_id)
+    if job is None:
+        raise Error.not_found(message=f"Crawl job {job_id} not found")
+    return Success.ok(data=job).to_resp()
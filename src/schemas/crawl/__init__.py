@@ -0,0 +1 @@
+from .crawl import CrawlJobRequest, CrawlJobSchema
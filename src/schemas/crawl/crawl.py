@@ -0,0 +1,32 @@
+import uuid
+from typing import Annotated
+
+from pydantic import Field, HttpUrl
+
+from src.core.base import BaseSchema
+from src.core.types import Extractor, State
+
+
+class CrawlJobRequest(BaseSchema):
+    seeds: Annotated[list[HttpUrl], Field(min_length=1, max_length=1000, description="Seed urls")]
+    max_pages: Annotated[int | None, Field(default=None, ge=1, description="Stop after this many pages")] = None
+    max_depth: Annotated[int | None, Field(default=None, ge=0, description="Link depth from the seeds")] = None
+    concurrency: Annotated[int | None, Field(default=None, ge=1, le=64, description="Crawl workers")] = None
+    extractor: Annotated[Extractor | None, Field(default=None, description="Content extractor for every page")] = None
+
+
+class CrawlJobSchema(BaseSchema):
+    id: Annotated[uuid.UUID, Field(...)]
+    state: Annotated[State, Field(default=State.QUEUED)]
+    seeds: Annotated[list[str], Field(default_factory=list)]
+    max_pages: Annotated[int | None, Field(default=None)] = None
+    max_depth: Annotated[int | None, Field(default=None)] = None
+    concurrency: Annotated[int | None, Field(default=None)] = None
+    extractor: Annotated[Extractor | None, Field(default=None)] = None
+    pages_done: Annotated[int, Field(default=0, description="Pages crawled successfully")]
+    pages_failed: Annotated[int, Field(default=0, description="Pages that failed or timed out")]
+    pages_queued: Annotated[int, Field(default=0, description="New urls added to the frontier")]
+    rate: Annotated[float, Field(default=0.0, description="Processed pages per second")]
+    created_at: Annotated[str | None, Field(default=None)] = None
+    started_at: Annotated[str | None, Field(default=None)] = None
+    finished_at: Annotated[str | None, Field(default=None)] = None
@@ -6,17 +6,28 @@ from pydantic import Field
 
 from src.core.clients import (
     CacheClient,
+    ExtractionCache,
     HttpClientFactory,
+    NlpClient,
+    ParseExecutor,
+    SeenUrlFilter,
     SoupClient,
     get_cache_client,
+    get_extraction_cache,
     get_http_client_factory,
+    get_parse_executor,
+    get_seen_url_filter,
     get_soup_client,
 )
 from src.core.config import settings
+from src.core.types import QueueBackend
 from src.repos import DataRepo, TaskRepo, UrlRepo, get_data_repo, get_task_repo, get_url_repo
 
 from .crawl import CrawlService
 from .health import HealthService
+from .job import CrawlJobService
+from .nlp import NlpService
+from .queue import CrawlQueue, StreamCrawlQueue
 
 
 async def get_health_service(
@@ -25,19 +36,90 @@ async def get_health_service(
     yield HealthService(cache_client)
 
 
+def create_crawl_queue(task_repo: TaskRepo, cache_client: CacheClient) -> CrawlQueue:
+    if settings.crawl_queue == QueueBackend.STREAM:
+        return StreamCrawlQueue(
+            task_repo,
+            settings.crawl_url_expiration,
+            cache_client,
+            min_idle_ms=settings.crawl_queue_min_idle_ms,
+        )
+    return CrawlQueue(task_repo, settings.crawl_url_expiration)
+
+
+async def get_crawl_queue(
+    task_repo: Annotated[TaskRepo, Field(...)] = Depends(get_task_repo),
+    cache_client: Annotated[CacheClient, Field(...)] = Depends(get_cache_client),
+) -> AsyncGenerator[CrawlQueue]:
+    yield create_crawl_queue(task_repo, cache_client)
+
+
+def create_nlp_service(data_repo: DataRepo, nlp_client: NlpClient) -> NlpService:
+    return NlpService(data_repo, nlp_client, batch_size=settings.nlp_batch_size * settings.nlp_n_process * 4)
+
+
+async def get_crawl_job_service(
+    cache_client: Annotated[CacheClient, Field(...)] = Depends(get_cache_client),
+) -> AsyncGenerator[CrawlJobService]:
+    yield CrawlJobService(cache_client)
+
+
+def create_crawl_service(
+    http_client_factory: HttpClientFactory,
+    soup_client: SoupClient,
+    task_repo: TaskRepo,
+    url_repo: UrlRepo,
+    data_repo: DataRepo,
+    seen_url_filter: SeenUrlFilter | None = None,
+    crawl_queue: CrawlQueue | None = None,
+    job_service: CrawlJobService | None = None,
+    parse_executor: ParseExecutor | None = None,
+    extraction_cache: ExtractionCache | None = None,
+) -> CrawlService:
+    return CrawlService(
+        http_client_factory,
+        soup_client,
+        task_repo,
+        url_repo,
+        data_repo,
+        settings.crawl_base_url,
+        settings.crawl_url_expiration,
+        settings.crawl_workers,
+        settings.crawl_claim_batch_size,
+        settings.crawl_bulk_batch_size,
+        settings.crawl_host_delay,
+        settings.crawl_host_concurrency,
+        seen_url_filter=seen_url_filter,
+        crawl_queue=crawl_queue,
+        job_service=job_service,
+        parse_executor=parse_executor,
+        extraction_cache=extraction_cache,
+        crawl_extractor=settings.crawl_extractor,
+        crawl_extractor_hosts=settings.crawl_extractor_hosts,
+    )
+
+
 async def get_crawl_service(
     http_client_factory: Annotated[HttpClientFactory, Field(...)] = Depends(get_http_client_factory),
     soup_client: Annotated[SoupClient, Field(...)] = Depends(get_soup_client),
     state_repo: Annotated[TaskRepo, Field(...)] = Depends(get_task_repo),
     url_repo: Annotated[UrlRepo, Field(...)] = Depends(get_url_repo),
-    data_repo: Annotated[DataRepo, Field(...)] = Depends(get_data_repo)
+    data_repo: Annotated[DataRepo, Field(...)] = Depends(get_data_repo),
+    seen_url_filter: Annotated[SeenUrlFilter | None, Field(...)] = Depends(get_seen_url_filter),
+    crawl_queue: Annotated[CrawlQueue, Field(...)] = Depends(get_crawl_queue),
+    job_service: Annotated[CrawlJobService, Field(...)] = Depends(get_crawl_job_service),
+    parse_executor: Annotated[ParseExecutor, Field(...)] = Depends(get_parse_executor),
+    extraction_cache: Annotated[ExtractionCache | None, Field(...)] = Depends(get_extraction_cache),
 ) -> AsyncGenerator[CrawlService]:
-    yield CrawlService(
+    yield create_crawl_service(
         http_client_factory,
         soup_client,
         state_repo,
         url_repo,
         data_repo,
-        settings.crawl_base_url,
-        settings.crawl_url_expiration
+        seen_url_filter=seen_url_filter,
+        crawl_queue=crawl_queue,
+        job_service=job_service,
+        parse_executor=parse_executor,
+        extraction_cache=extraction_cache,
     )
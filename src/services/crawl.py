@@ -1,3 +1,8 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from http import HTTPStatus
 from typing import Any
 
 import httpx
@@ -6,11 +11,51 @@ from pydantic import HttpUrl
 
 import src.core.common as common
 from src.core.base import BaseService
-from src.core.clients import HttpClientFactory, SoupClient
-from src.core.formats import clean_url, serialize
-from src.core.types import Action, ModelType, State
+from src.core.clients import (
+    ExtractionCache,
+    HttpClientFactory,
+    ParseExecutor,
+    ResponseTooLargeError,
+    SeenUrlFilter,
+    SoupClient,
+)
+from src.core.constants import CRAWL_HOST_BUFFER, CRAWL_IDLE_DELAY_S, CRAWL_STATS_INTERVAL, URL_MAX_LENGTH
+from src.core.extract import extract_page, resolve_page
+from src.core.formats import CanonicalUrl, clean_url, serialize
+from src.core.metrics import CrawlStats
+from src.core.scheduler import HostScheduler
+from src.core.types import Action, Extractor, ModelType, State
 from src.db.models import Data, Task, Url
 from src.repos import DataRepo, TaskRepo, UrlRepo
+from src.schemas.crawl import CrawlJobSchema
+
+from .job import CrawlJobService
+from .queue import CrawlQueue
+
+
+@dataclass
+class _CrawlRun:
+    stats: CrawlStats
+    scheduler: HostScheduler[tuple[Url, Task]]
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    max_pages: int | None = None
+    max_depth: int | None = None
+    job_id: uuid.UUID | None = None
+    # Tag of the tasks this run claims and creates; None drains the untagged frontier
+    tag: uuid.UUID | None = None
+    extractor: Extractor | None = None
+    stop: asyncio.Event | None = None
+    handed_out: int = 0
+    # No claims before this time.monotonic(), after one that yielded nothing to schedule
+    refill_after: float = 0.0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_pages is not None and self.handed_out >= self.max_pages
+
+    @property
+    def stopping(self) -> bool:
+        return self.stop is not None and self.stop.is_set()
 
 
 class CrawlService(BaseService):
@@ -19,6 +64,11 @@ class CrawlService(BaseService):
     _task_repo: TaskRepo
     _url_repo: UrlRepo
     _data_repo: DataRepo
+    _seen_url_filter: SeenUrlFilter | None
+    _parse_executor: ParseExecutor | None
+    _extraction_cache: ExtractionCache | None
+    _queue: CrawlQueue
+    _job_service: CrawlJobService | None
 
     def __init__(
         self,
@@ -28,7 +78,19 @@ class CrawlService(BaseService):
         url_repo: UrlRepo,
         data_repo: DataRepo,
         crawl_base_url: HttpUrl,
-        crawl_url_expiration: int
+        crawl_url_expiration: int,
+        crawl_workers: int = 1,
+        crawl_claim_batch_size: int = 16,
+        crawl_bulk_batch_size: int = 500,
+        crawl_host_delay: float = 1.0,
+        crawl_host_concurrency: int = 1,
+        seen_url_filter: SeenUrlFilter | None = None,
+        crawl_queue: CrawlQueue | None = None,
+        job_service: CrawlJobService | None = None,
+        parse_executor: ParseExecutor | None = None,
+        extraction_cache: ExtractionCache | None = None,
+        crawl_extractor: Extractor = Extractor.HTML_TO_JSON,
+        crawl_extractor_hosts: dict[str, Extractor] | None = None,
     ) -> None:
         super().__init__()
         self._http_client_factory = http_client_factory
@@ -36,169 +98,519 @@ class CrawlService(BaseService):
         self._task_repo = task_repo
         self._url_repo = url_repo
         self._data_repo = data_repo
-        self._crawl_url = HttpUrl(f"{crawl_base_url}crawl")
+        self._seen_url_filter = seen_url_filter
+        self._queue = crawl_queue or CrawlQueue(task_repo, crawl_url_expiration)
+        self._job_service = job_service
+        self._parse_executor = parse_executor
+        self._extraction_cache = extraction_cache
+        self._crawl_url = CanonicalUrl.parse(f"{crawl_base_url}crawl")
         self._crawl_url_expiration = crawl_url_expiration
+        self._crawl_workers = crawl_workers
+        self._crawl_claim_batch_size = crawl_claim_batch_size
+        self._crawl_bulk_batch_size = crawl_bulk_batch_size
+        self._crawl_host_delay = crawl_host_delay
+        self._crawl_host_concurrency = crawl_host_concurrency
+        self._crawl_extractor = crawl_extractor
+        self._crawl_extractor_hosts = crawl_extractor_hosts or {}
 
-    async def _ensure_url_task_status(self, url: HttpUrl, delay_s: int = 3600) -> tuple[Url, Task, bool]:
-        base_url = serialize(common.get_base_url(url))
+    async def _ensure_url_task_status(self, url: CanonicalUrl, delay_s: int = 3600) -> tuple[Url, Task, bool]:
+        base_url = serialize(url.base_url)
         url_str = serialize(url)
 
-        # Get or create the URL
-        db_url, url_created = await self._url_repo.get_or_create(
-            url=url_str,
-            base_url=base_url,
-        )
+        # Get or create the URL, inserting straight away when the filter has never seen it
+        if self._seen_url_filter and not (await self._seen_url_filter.contains([url_str]))[0]:
+            db_url, url_created = await self._url_repo.create_or_get(
+                url=url_str,
+                base_url=base_url,
+            )
+            await self._seen_url_filter.add([url_str])
+        else:
+            db_url, url_created = await self._url_repo.get_or_create(
+                url=url_str,
+                base_url=base_url,
+            )
 
         # Try to get existing task
         db_task = await self._task_repo.get_or_none(
             ref=db_url.pk,
-            ref_type=ModelType.URL,
+            type=ModelType.URL,
         )
 
         # If no task exists or URL is newly created, create task
         if db_task is None:
             db_task = await self._task_repo.create(
                 ref=db_url.pk,
-                ref_type=ModelType.URL,
+                type=ModelType.URL,
                 state=State.NEW,
-                action=Action.UNKNOWN,
+                action=Action.CRAWL,
             )
             return db_url, db_task, True
 
         # Task exists — check if it's NEW or expired
         return db_url, db_task, db_task.state == State.NEW or db_task.is_expired(delay_s)
 
-    async def _find_next_url_task(self) -> tuple[Url | None, Task | None]:
-        logger.debug(f"{self._tag}|_find_next_url_task()")
+    async def _claim_url_tasks(
+        self, batch_size: int, ids: list[uuid.UUID] | None = None, job_id: uuid.UUID | None = None
+    ) -> list[tuple[Url, Task]]:
+        tasks = await self._queue.claim(batch_size, ids=ids, job_id=job_id)
+        if not tasks:
+            return []
 
-        # Step 1: Try finding a NEW, RUNNING task first
-        states = [State.NEW, State.RUNNING]
-        next_task = await self._task_repo.get_first_by_states(
-            ref_type=ModelType.URL,
-            states=states,
-        )
-        logger.debug(f"{self._tag}|_find_next_url_task()| NEW task: {next_task}")
+        urls = {
+            db_url.pk: db_url
+            for db_url in await self._url_repo.all(id__in=[task.ref for task in tasks])
+        }
+        claimed: list[tuple[Url, Task]] = []
+        for task in tasks:
+            db_url = urls.get(task.ref)
+            if db_url is None:
+                logger.warning(f"{self._tag}|_claim_url_tasks(): No url found for task {task.id}")
+                await self._finish_url_task(task, State.FAILED)
+                continue
+            claimed.append((db_url, task))
 
-        # Step 2: If no NEW task, look for expired ones
-        if not next_task:
-            next_task = await self._task_repo.get_first_expired(
-                ref_type=ModelType.URL,
-                expire_after_s=self._crawl_url_expiration
-            )
-            if next_task:
-                logger.debug(f"{self._tag}|_find_next_url_task()| Expired task: {next_task.id}")
+        logger.debug(f"{self._tag}|_claim_url_tasks(): Claimed {len(claimed)} url tasks")
+        return claimed
+
+    async def _schedule(self, run: _CrawlRun, claimed: list[tuple[Url, Task]]) -> int:
+        """
+        Queues claimed tasks on their host. Tasks of hosts that already have a full
+        buffer go back to the frontier, behind everything else, so the next claim
+        reaches other hosts instead of more of the same one.
 
-        # Step 3: Get the associated URL
-        if next_task:
-            url = await self._url_repo.get_by_pk(next_task.ref)
-            if url:
-                return url, next_task
+        Returns:
+            int: Number of tasks queued.
+        """
+        overflow = [
+            db_task for db_url, db_task in claimed if not run.scheduler.push(db_url.base_url, (db_url, db_task))
+        ]
+        if overflow:
+            await self._queue.release(overflow)
+        return len(claimed) - len(overflow)
 
+    async def _claim_next_url_task(self, run: _CrawlRun) -> tuple[Url | None, Task | None]:
+        async with run.lock:
+            if run.exhausted or run.stopping:
+                return None, None
+            # Buffered tasks are RUNNING; give back the ones a throttled host kept waiting
+            # well before they expire and another process claims them a second time
+            stale = run.scheduler.expire(self._crawl_url_expiration / 2)
+            if stale:
+                await self._queue.release([db_task for _, db_task in stale])
+            # Top up the per-host queues with one atomic batch claim, bounded so that a
+            # throttled host cannot pull the whole frontier into memory
+            batch_size = self._crawl_claim_batch_size
+            if run.max_pages is not None:
+                batch_size = min(batch_size, run.max_pages - run.handed_out - len(run.scheduler))
+            if (
+                batch_size > 0
+                and len(run.scheduler) < self._crawl_claim_batch_size * run.stats.workers
+                and time.monotonic() >= run.refill_after
+            ):
+                queued = await self._schedule(run, await self._claim_url_tasks(batch_size, job_id=run.tag))
+                # Empty frontier, or only more tasks of hosts that are full already
+                if not queued:
+                    run.refill_after = time.monotonic() + CRAWL_IDLE_DELAY_S
+            scheduled = run.scheduler.pop()
+            if scheduled:
+                run.handed_out += 1
+        if scheduled:
+            return scheduled[1]
         return None, None
 
-    async def _store_new_extracted_urls(self, urls: list[HttpUrl]) -> None:
+    def _normalize_urls(self, urls: list[Any]) -> dict[str, str]:
+        normalized: dict[str, str] = {}
+        for extracted_url in urls:
+            try:
+                url = clean_url(extracted_url)
+            except ValueError:
+                logger.warning(f"{self._tag}|_normalize_urls(): Skipped invalid URL -> {extracted_url}")
+                continue
+
+            url_str = serialize(url)
+            if url_str in normalized or len(url_str) > URL_MAX_LENGTH:
+                continue
+            normalized[url_str] = serialize(url.base_url)
+
+        return normalized
+
+    @staticmethod
+    def _task_depth(db_task: Task) -> int:
+        meta = db_task.meta if isinstance(db_task.meta, dict) else {}
+        return int(meta.get("depth", 0))
+
+    def _select_extractor(self, run: _CrawlRun, db_task: Task, url: CanonicalUrl) -> Extractor:
+        """The run's extractor, then the one its task was queued with, the host's, the default."""
+        if run.extractor:
+            return run.extractor
+        meta = db_task.meta if isinstance(db_task.meta, dict) else {}
+        if meta.get("extractor") in Extractor:
+            return Extractor(meta["extractor"])
+        return self._crawl_extractor_hosts.get(url.host, self._crawl_extractor)
+
+    @staticmethod
+    def _conditional_headers(db_url: Url) -> dict[str, str]:
+        meta = db_url.meta if isinstance(db_url.meta, dict) else {}
+        headers: dict[str, str] = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    @staticmethod
+    def _response_validators(content: dict[str, Any]) -> dict[str, str]:
+        headers = common.safely_deep_get(content, keys="data.headers", default={}) or {}
+        headers = {str(name).lower(): value for name, value in headers.items()}
+        validators: dict[str, str] = {}
+        if headers.get("etag"):
+            validators["etag"] = headers["etag"]
+        if headers.get("last-modified"):
+            validators["last_modified"] = headers["last-modified"]
+        return validators
+
+    def _host_scheduler(self) -> HostScheduler[tuple[Url, Task]]:
+        return HostScheduler(
+            delay_s=self._crawl_host_delay,
+            concurrency=self._crawl_host_concurrency,
+            max_ready=max(CRAWL_HOST_BUFFER, self._crawl_host_concurrency),
+        )
+
+    async def _report_progress(self, run: _CrawlRun, **counters: int) -> None:
+        if run.job_id and self._job_service:
+            await self._job_service.progress(run.job_id, **counters)
+
+    async def _store_new_extracted_urls(
+        self,
+        urls: list[Any],
+        depth: int = 1,
+        extractor: Extractor | None = None,
+        job_id: uuid.UUID | None = None,
+    ) -> list[uuid.UUID]:
         logger.debug(f"{self._tag}|_store_new_extracted_urls(): Storing {len(urls)} extracted URLs")
 
-        for extracted_url in urls:
-            base_url = serialize(common.get_base_url(extracted_url))
-            url_str = serialize(extracted_url)
+        normalized = self._normalize_urls(urls)
+        if self._seen_url_filter:
+            # Known urls never reach the database
+            seen = await self._seen_url_filter.contains(list(normalized))
+            normalized = {
+                url_str: base_url
+                for (url_str, base_url), is_seen in zip(normalized.items(), seen, strict=True)
+                if not is_seen
+            }
 
-            # Create or get the Url entry
-            db_url, url_created = await self._url_repo.get_or_create(
-                url=url_str,
-                base_url=base_url,
-            )
+        url_ids = await self._url_repo.create_new(
+            normalized, batch_size=self._crawl_bulk_batch_size
+        )
+        # Tasks for every url, not only the new ones: a url whose task insert never
+        # happened (the process died in between) gets it now. Existing tasks are skipped.
+        stored = await self._url_repo.get_by_urls(list(normalized))
+        task_ids = await self._task_repo.create_new(
+            [db_url.pk for db_url in stored.values()],
+            ref_type=ModelType.URL,
+            # A run claims its own tasks from the table, never from the queue
+            state=State.NEW if job_id else self._queue.initial_state,
+            batch_size=self._crawl_bulk_batch_size,
+            # Tasks carry the job's extractor to whichever worker claims them
+            meta={"depth": depth, "extractor": extractor} if extractor else {"depth": depth},
+            job_id=job_id,
+        )
+        if not job_id:
+            await self._queue.publish(task_ids)
+        if self._seen_url_filter:
+            await self._seen_url_filter.add(list(normalized))
 
-            # Create task only if URL was newly created or no task exists
-            db_task = await self._task_repo.get_or_none(
-                ref=db_url.pk,
-                ref_type=ModelType.URL,
+        logger.debug(
+            f"{self._tag}|_store_new_extracted_urls(): {len(normalized)} unseen, "
+            f"{len(url_ids)} new urls, {len(task_ids)} new tasks"
+        )
+        return task_ids
+
+    async def _crawl_url_task(self, run: _CrawlRun, next_db_url: Url, next_db_task: Task) -> State:
+        """
+        Fetches one page through the crawl server and stores its content and outlinks.
+
+        The crawl server is called as `GET <crawl_base_url>?url=<page>`, with the page's
+        If-None-Match and If-Modified-Since validators when earlier crawls stored them.
+        It forwards them to the origin and answers 200 with a JSON body whose `data`
+        holds the origin's `status`, `headers` and `html`. A server that answers 304
+        itself instead, with the origin's headers, is handled the same as `data.status`
+        304: the page is not modified.
+
+        Returns:
+            State: Final state of the task.
+        """
+        url = CanonicalUrl.parse(next_db_url.url)
+        extractor = self._select_extractor(run, next_db_task, url)
+        meta = next_db_url.meta if isinstance(next_db_url.meta, dict) else {}
+        # A page stored with another extractor is fetched and extracted again even if unchanged
+        reextract = meta.get("extractor") != extractor
+        logger.debug(f"{self._tag}|_crawl_url_task(): Crawling Server URL: {self._crawl_url}")
+        http_client = self._http_client_factory.get_client(
+            url=self._crawl_url
+        )
+        try:
+            params = {"url": url}
+            content: dict[str, Any] = await http_client.get(
+                url=self._crawl_url, params=params,
+                headers=None if reextract else self._conditional_headers(next_db_url) or None,
             )
+        except httpx.HTTPStatusError as error:
+            if error.response.status_code != HTTPStatus.NOT_MODIFIED:
+                raise
+            content = {"data": {"status": HTTPStatus.NOT_MODIFIED, "headers": dict(error.response.headers)}}
+        except httpx.ConnectError as error:
+            logger.error(f"{self._tag}|_crawl_url_task(): Connection error fetching {url}: {error}")
+            return await self._finish_url_task(next_db_task, State.FAILED)
+        except httpx.ReadTimeout as error:
+            logger.error(f"{self._tag}|_crawl_url_task(): Timeout fetching {url}: {error}")
+            return await self._finish_url_task(next_db_task, State.TIMEOUT)
+        except ResponseTooLargeError as error:
+            logger.error(f"{self._tag}|_crawl_url_task(): Skipped oversized page {url}: {error}")
+            return await self._finish_url_task(next_db_task, State.FAILED)
+        logger.debug(f"{self._tag}|_crawl_url_task(): Fetched content from {url}")
+        validators = self._response_validators(content)
+        if common.safely_deep_get(content, keys="data.status") == HTTPStatus.NOT_MODIFIED:
+            logger.debug(f"{self._tag}|_crawl_url_task(): Not modified {url}")
+            await self._url_repo.update_meta(next_db_url, **validators)
+            return await self._finish_url_task(next_db_task, State.COMPLETED)
+
+        html = common.safely_deep_get(content, keys="data.html")
+        content_hash = common.compute_checksum(html) if html else None
+        if content_hash and content_hash == meta.get("content_hash") and not reextract:
+            # Origin ignored the validators but sent the same bytes; links are unchanged too
+            logger.debug(f"{self._tag}|_crawl_url_task(): Unchanged content {url}")
+            await self._url_repo.update_meta(next_db_url, **validators)
+            return await self._finish_url_task(next_db_task, State.COMPLETED)
 
-            if db_task is None:
-                await self._task_repo.create(
-                    ref=db_url.pk,
-                    ref_type=ModelType.URL,
-                    state=State.NEW,
-                )
+        if not html:
+            logger.error(f"{self._tag}|_crawl_url_task(): No HTML content found for {url}")
+            return await self._finish_url_task(next_db_task, State.FAILED)
 
-    async def crawl(self, url: HttpUrl) -> None:
-        url = clean_url(url)
-        logger.debug(f"{self._tag}|crawl(): Starting crawl for {url}")
-        next_db_url, next_db_task, task_status = await self._ensure_url_task_status(url)
+        # One parse gives the content, the outlinks and the page metadata
+        page = resolve_page(next_db_url.url, await self._extract_page(html, content_hash, extractor))
+        logger.debug(f"{self._tag}|_crawl_url_task(): Analyzed {url} with {extractor}: {len(page.outlinks)} outlinks")
 
-        logger.debug(f"{self._tag}|crawl(): _ensure_url_task_status: {next_db_url.url} {task_status}")
+        depth = self._task_depth(next_db_task)
+        if page.outlinks and (run.max_depth is None or depth < run.max_depth):
+            task_ids = await self._store_new_extracted_urls(page.outlinks, depth + 1, run.extractor, run.tag)
+            run.stats.queued += len(task_ids)
+            await self._report_progress(run, queued=len(task_ids))
 
-        if not task_status:
-            next_db_url, next_db_task = await self._find_next_url_task()
+        data: Data | None = await self._data_repo.create_or_update(
+            url=next_db_url,
+            content=html,
+            meta={
+                "size": len(html.encode("utf-8")),
+                "json": page.content,
+                "page": page.meta,
+                "extractor": extractor,
+            },
+            refresh_meta=reextract,
+        )
+        if data:
+            logger.debug(f"{self._tag}|_crawl_url_task(): Data saved: {data}")
+        else:
+            logger.debug(f"{self._tag}|_crawl_url_task(): Data unchanged for {url}")
+        await self._url_repo.update_meta(
+            next_db_url, title=page.meta.get("title"), content_hash=content_hash, extractor=extractor, **validators
+        )
+        return await self._finish_url_task(next_db_task, State.COMPLETED)
 
-        logger.debug(f"{self._tag}|crawl(): next_db_url: {next_db_url}")
+    async def _extract_page(self, html: str, content_hash: str, extractor: Extractor) -> dict[str, Any]:
+        """Extraction for `html`, from the cache when the same document was seen before."""
+        if self._extraction_cache:
+            extracted = await self._extraction_cache.get(content_hash, extractor)
+            if extracted is not None:
+                return extracted
 
-        while next_db_url and next_db_task:
-            await self._task_repo.update_by_id(
-                task_id=next_db_task.id,
-                action=Action.CRAWL,
-                state=State.RUNNING
-            )
-            url = HttpUrl(next_db_url.url)
-            logger.debug(f"{self._tag}|crawl(): Crawling Server URL: {self._crawl_url}")
-            http_client = self._http_client_factory.get_client(
-                url=self._crawl_url
-            )
+        if self._parse_executor:
+            extracted = await self._parse_executor.run(extract_page, html, extractor)
+        else:
+            extracted = extract_page(html, extractor)
+
+        if self._extraction_cache:
+            await self._extraction_cache.set(content_hash, extractor, extracted)
+        return extracted
+
+    async def _finish_url_task(self, db_task: Task, state: State) -> State:
+        await self._queue.complete(db_task, state)
+        return state
+
+    async def _crawl_worker(self, run: _CrawlRun) -> None:
+        while True:
+            # A worker counts as active while claiming too, so idle peers keep
+            # waiting for URLs it may still discover.
+            run.stats.active += 1
             try:
-                params = {"url": HttpUrl(next_db_url.url)}
-                content: dict[str, Any] = await http_client.get(
-                    url=self._crawl_url, params=params,
-                )
-            except httpx.ConnectError as error:
-                logger.error(f"{self._tag}|crawl(): Connection error fetching {url}: {error}")
-                await self._task_repo.update_by_id(
-                    task_id=next_db_task.id,
-                    action=Action.CRAWL,
-                    state=State.FAILED
-                )
-                next_db_url, next_db_task = await self._find_next_url_task()
-                continue
-            except httpx.ReadTimeout as error:
-                logger.error(f"{self._tag}|crawl(): Timeout fetching {url}: {error}")
-                await self._task_repo.update_by_id(
-                    task_id=next_db_task.id,
-                    action=Action.CRAWL,
-                    state=State.TIMEOUT
-                )
-                next_db_url, next_db_task = await self._find_next_url_task()
-                continue
-            logger.debug(f"{self._tag}|crawl(): Fetched content from {url}")
-            html = common.safely_deep_get(content,keys= "data.html")
-            urls = common.safely_deep_get(content, keys="data.urls", default=[])
-            if urls:
-                await self._store_new_extracted_urls(urls)
-            if not html:
-                logger.error(f"{self._tag}|crawl(): No HTML content found for {url}")
-                await self._task_repo.update_by_id(
-                    task_id=next_db_task.id,
-                    action=Action.CRAWL,
-                    state=State.FAILED
-                )
-                next_db_url, next_db_task = await self._find_next_url_task()
-                continue
-            json = common.html_to_json(url, html)
-            logger.debug(f"{self._tag}|crawl(): Converted HTML to JSON for {url}")
-            data: Data = await  self._data_repo.create_or_update(
-                url=next_db_url,
-                content=html,
-                meta={
-                    "size": len(html.encode("utf-8")),
-                    "json": json,
-                }
+                next_db_url, next_db_task = await self._claim_next_url_task(run)
+                if next_db_url and next_db_task:
+                    try:
+                        state = await self._crawl_claimed(run, next_db_url, next_db_task)
+                    except asyncio.CancelledError:
+                        # Shutdown grace ran out mid-page; let another worker retry it
+                        await self._queue.release([next_db_task])
+                        raise
+                    finally:
+                        run.scheduler.release(next_db_url.base_url)
+                    run.stats.record(state)
+                    await self._report_progress(
+                        run,
+                        done=int(state == State.COMPLETED),
+                        failed=int(state != State.COMPLETED),
+                    )
+                    if run.stats.processed % CRAWL_STATS_INTERVAL == 0:
+                        logger.info(f"{self._tag}|_crawl_worker(): {run.stats}")
+                        if self._parse_executor:
+                            logger.info(f"{self._tag}|_crawl_worker(): {self._parse_executor.stats}")
+                        if self._extraction_cache:
+                            logger.info(f"{self._tag}|_crawl_worker(): {self._extraction_cache.stats}")
+                    continue
+            finally:
+                run.stats.active -= 1
+
+            if run.exhausted or run.stopping:
+                return
+            # A long-running worker keeps polling an empty frontier until stopped
+            if run.stop is None and run.stats.active == 0 and not run.scheduler:
+                return
+            # Wake up when the next throttled host gets a token, or poll for new work
+            delay = min(CRAWL_IDLE_DELAY_S, run.scheduler.next_ready_in()) if run.scheduler else CRAWL_IDLE_DELAY_S
+            await asyncio.sleep(max(delay, 0.01))
+
+    async def _crawl_claimed(self, run: _CrawlRun, next_db_url: Url, next_db_task: Task) -> State:
+        try:
+            return await self._crawl_url_task(run, next_db_url, next_db_task)
+        except Exception as error:
+            logger.error(f"{self._tag}|_crawl_claimed(): Unexpected error crawling {next_db_url.url}: {error}")
+            return await self._finish_url_task(next_db_task, State.ERROR)
+
+    async def _run_workers(self, run: _CrawlRun) -> None:
+        try:
+            await asyncio.gather(*(self._crawl_worker(run) for _ in range(run.stats.workers)))
+        finally:
+            # Tasks claimed but never started (page limit hit or shutdown) go back to the frontier
+            await self._queue.release([db_task for _, db_task in run.scheduler.drain()])
+            await self._queue.flush()
+
+    async def crawl(self, url: HttpUrl, workers: int | None = None) -> CrawlStats:
+        return await self.crawl_urls([url], workers=workers)
+
+    async def crawl_urls(
+        self,
+        urls: list[HttpUrl | str],
+        workers: int | None = None,
+        max_pages: int | None = None,
+        max_depth: int | None = None,
+        job_id: uuid.UUID | None = None,
+        extractor: Extractor | None = None,
+    ) -> CrawlStats:
+        """
+        Crawls from `urls` until the frontier is empty or `max_pages` pages were handed
+        to workers. Seeds are crawled when they are new or their last crawl expired.
+
+        Without `job_id` the run then drains the shared frontier, like the standalone
+        worker. A job's run tags its seeds and the tasks it creates and only claims
+        tagged tasks, so it stays within its own seeds; links to urls that already have
+        a task are left to that task. A job none of whose seeds is due crawls nothing.
+        When a job's run ends its tasks are untagged, and whatever it did not get to is
+        left to the standalone worker. Links are followed up to `max_depth` hops from
+        the seeds. Without an `extractor`, pages use the extractor their task was queued
+        with, then the one configured for their host, then the crawl_extractor setting.
+
+        Parameters:
+            urls: Seed urls.
+            workers: Concurrent workers, defaults to the crawl_workers setting.
+            max_pages: Stop after this many pages.
+            max_depth: Do not queue links found deeper than this.
+            job_id: Crawl job to report progress to and to scope the run to.
+            extractor: Content extractor for every page of this crawl.
+
+        Returns:
+            CrawlStats: Counters of the finished run.
+        """
+        seeds = [clean_url(url) for url in urls]
+        workers = workers or self._crawl_workers
+        logger.debug(f"{self._tag}|crawl_urls(): Starting crawl for {len(seeds)} seeds with {workers} workers")
+
+        run = _CrawlRun(
+            stats=CrawlStats(workers=workers),
+            scheduler=self._host_scheduler(),
+            max_pages=max_pages,
+            max_depth=max_depth,
+            job_id=job_id,
+            tag=job_id,
+            extractor=extractor,
+        )
+
+        seed_task_ids: list[uuid.UUID] = []
+        for url in seeds:
+            next_db_url, next_db_task, task_status = await self._ensure_url_task_status(
+                url, self._crawl_url_expiration
             )
-            logger.debug(f"{self._tag}|crawl(): Data saved: {data}")
-            await self._task_repo.update_by_id(
-                task_id=next_db_task.id,
-                action=Action.CRAWL,
-                state=State.COMPLETED
+            logger.debug(f"{self._tag}|crawl_urls(): _ensure_url_task_status: {next_db_url.url} {task_status}")
+            if task_status:
+                seed_task_ids.append(next_db_task.id)
+        try:
+            queued = 0
+            if seed_task_ids:
+                # Claim the seeds themselves first; another worker may already own them
+                claimed = await self._claim_url_tasks(len(seed_task_ids), ids=seed_task_ids, job_id=run.tag)
+                queued = await self._schedule(run, claimed)
+            if run.tag and not queued:
+                logger.warning(f"{self._tag}|crawl_urls(): No seed of job {run.tag} is due or claimable")
+            else:
+                await self._run_workers(run)
+        finally:
+            if run.tag:
+                await self._task_repo.clear_job(run.tag)
+        logger.info(f"{self._tag}|crawl_urls(): Finished crawl for {len(seeds)} seeds: {run.stats}")
+        return run.stats
+
+    async def crawl_job(self, job: CrawlJobSchema) -> CrawlStats | None:
+        if self._job_service:
+            await self._job_service.start(job.id)
+        try:
+            stats = await self.crawl_urls(
+                job.seeds,
+                workers=job.concurrency,
+                max_pages=job.max_pages,
+                max_depth=job.max_depth,
+                job_id=job.id,
+                extractor=job.extractor,
             )
-            next_db_url, next_db_task = await self._find_next_url_task()
-            logger.debug(f"{self._tag}|crawl(): Extracted URLs: {urls}")
+        except Exception as error:
+            logger.error(f"{self._tag}|crawl_job(): Crawl job {job.id} failed: {error}")
+            if self._job_service:
+                await self._job_service.finish(job.id, State.FAILED)
+            return None
 
-        return None
+        if self._job_service:
+            # Nothing crawled: every seed was recent or owned by another worker
+            await self._job_service.finish(job.id, State.COMPLETED if stats.processed else State.SKIPPED)
+        return stats
+
+    async def run_worker(self, stop: asyncio.Event, workers: int | None = None) -> CrawlStats:
+        """
+        Crawls the shared frontier, the tasks no crawl run has tagged, until `stop` is
+        set, without seeds or page limits.
+        Once stopped, no new tasks are claimed, pages in flight are finished and tasks
+        still waiting in the host queues are released.
+
+        Parameters:
+            stop: Event that ends the loop.
+            workers: Concurrent workers, defaults to the crawl_workers setting.
+
+        Returns:
+            CrawlStats: Counters of the finished run.
+        """
+        workers = workers or self._crawl_workers
+        logger.info(f"{self._tag}|run_worker(): Starting with {workers} workers")
+        run = _CrawlRun(
+            stats=CrawlStats(workers=workers),
+            scheduler=self._host_scheduler(),
+            stop=stop,
+        )
+        await self._run_workers(run)
+        logger.info(f"{self._tag}|run_worker(): Stopped: {run.stats}")
+        return run.stats
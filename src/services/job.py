@@ -0,0 +1,84 @@
+import uuid
+from datetime import UTC, datetime
+
+from src.core.base import BaseService
+from src.core.clients import CacheClient
+from src.core.constants import CRAWL_JOB_TTL_S
+from src.core.formats import serialize, utc_iso_timestamp
+from src.core.types import State
+from src.schemas.crawl import CrawlJobRequest, CrawlJobSchema
+
+
+class CrawlJobService(BaseService):
+    """
+    Keeps crawl jobs and their progress counters in a cache hash per job, so progress
+    can be read without querying the database.
+    """
+
+    _cache_client: CacheClient
+
+    def __init__(self, cache_client: CacheClient, ttl_s: int = CRAWL_JOB_TTL_S) -> None:
+        super().__init__()
+        self._cache_client = cache_client
+        self._ttl_s = ttl_s
+
+    @staticmethod
+    def _key(job_id: uuid.UUID) -> str:
+        return f"crawl:job:{job_id}"
+
+    async def create(self, request: CrawlJobRequest) -> CrawlJobSchema:
+        job = CrawlJobSchema(
+            id=uuid.uuid4(),
+            seeds=[serialize(seed) for seed in request.seeds],
+            max_pages=request.max_pages,
+            max_depth=request.max_depth,
+            concurrency=request.concurrency,
+            extractor=request.extractor,
+            created_at=utc_iso_timestamp(),
+        )
+        await self._cache_client.hset(
+            self._key(job.id),
+            {"job": job.model_dump_json(), "state": job.state.value},
+            ttl=self._ttl_s,
+        )
+        return job
+
+    async def get(self, job_id: uuid.UUID) -> CrawlJobSchema | None:
+        fields = await self._cache_client.hgetall(self._key(job_id))
+        if not fields:
+            return None
+
+        job = CrawlJobSchema.model_validate_json(fields["job"])
+        job.state = State(fields["state"])
+        job.pages_done = int(fields.get("done", 0))
+        job.pages_failed = int(fields.get("failed", 0))
+        job.pages_queued = int(fields.get("queued", 0))
+        job.started_at = fields.get("started_at")
+        job.finished_at = fields.get("finished_at")
+
+        if job.started_at:
+            started_at = datetime.fromisoformat(job.started_at)
+            finished_at = datetime.fromisoformat(job.finished_at) if job.finished_at else datetime.now(UTC)
+            elapsed = (finished_at - started_at).total_seconds()
+            job.rate = (job.pages_done + job.pages_failed) / elapsed if elapsed > 0 else 0.0
+        return job
+
+    async def start(self, job_id: uuid.UUID) -> None:
+        await self._cache_client.hset(
+            self._key(job_id),
+            {"state": State.RUNNING.value, "started_at": utc_iso_timestamp()},
+        )
+
+    async def finish(self, job_id: uuid.UUID, state: State) -> None:
+        await self._cache_client.hset(
+            self._key(job_id),
+            {"state": state.value, "finished_at": utc_iso_timestamp()},
+        )
+
+    async def progress(
+        self, job_id: uuid.UUID, done: int = 0, failed: int = 0, queued: int = 0
+    ) -> None:
+        counters = {"done": done, "failed": failed, "queued": queued}
+        counters = {field: amount for field, amount in counters.items() if amount}
+        if counters:
+            await self._cache_client.hincrby(self._key(job_id), counters)
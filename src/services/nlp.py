@@ -0,0 +1,110 @@
+import time
+import uuid
+from typing import Any
+
+from loguru import logger
+
+from src.core.base import BaseService
+from src.core.clients import NlpClient
+from src.core.metrics import NlpStats
+from src.core.types import DataSource, DataSubType, DataType
+from src.repos import DataRepo
+
+_SUBTYPES: dict[str, DataSubType] = {
+    "entities": DataSubType.ENTITIES,
+    "keywords": DataSubType.KEYWORDS,
+    "sentences": DataSubType.SENTENCES,
+}
+
+
+def _full_text(meta: Any) -> str:
+    content = meta.get("json") if isinstance(meta, dict) else None
+    text = content.get("full_text") if isinstance(content, dict) else None
+    return text if isinstance(text, str) else ""
+
+
+class NlpService(BaseService):
+    """
+    Annotates crawled pages with spaCy and stores entities, keywords and sentence
+    boundaries as `Data` children of the page, one row each.
+
+    A page is pending until it has a SENTENCES child made by the current model from
+    its current checksum, so a recrawl that changes the page makes it pending again
+    and a run can be stopped and restarted at any point. spaCy runs on the calling
+    thread: this is meant for the batch job, not the API process.
+    """
+
+    _data_repo: DataRepo
+    _nlp_client: NlpClient
+
+    def __init__(self, data_repo: DataRepo, nlp_client: NlpClient, batch_size: int = 256) -> None:
+        super().__init__()
+        self._data_repo = data_repo
+        self._nlp_client = nlp_client
+        self._batch_size = batch_size
+
+    def _is_current(self, meta: Any, checksum: str | None) -> bool:
+        return (
+            isinstance(meta, dict)
+            and meta.get("parent_checksum") == checksum
+            and meta.get("model") == self._nlp_client.model
+        )
+
+    async def _pending(self, pages: list[dict[str, Any]]) -> list[uuid.UUID]:
+        done = await self._data_repo.children_meta([page["id"] for page in pages], DataSubType.SENTENCES)
+        return [page["id"] for page in pages if not self._is_current(done.get(page["id"]), page["checksum"])]
+
+    async def _annotate(self, page_ids: list[uuid.UUID], stats: NlpStats) -> None:
+        pages = await self._data_repo.all(id__in=page_ids)
+        texts = [_full_text(page.meta) for page in pages]
+
+        started_at = time.perf_counter()
+        results = self._nlp_client.annotate(texts)
+        stats.nlp_s += time.perf_counter() - started_at
+
+        meta_base = {"model": self._nlp_client.model, "model_version": self._nlp_client.model_version}
+        children: list[dict[str, Any]] = []
+        for page, text, result in zip(pages, texts, results, strict=True):
+            meta = {**meta_base, "parent_checksum": page.checksum, "chars": len(text)}
+            # SENTENCES last: its presence is what marks the page as done
+            for key, subtype in _SUBTYPES.items():
+                children.append({
+                    "parent_id": page.id,
+                    "source": DataSource.SYSTEM,
+                    "type": DataType.NOTE,
+                    "subtype": subtype,
+                    "content": {key: result[key]},
+                    "meta": meta,
+                })
+        await self._data_repo.replace_children([page.id for page in pages], list(_SUBTYPES.values()), children)
+        stats.annotated += len(pages)
+        stats.chars += sum(len(text) for text in texts)
+
+    async def annotate_pending(self, limit: int | None = None) -> NlpStats:
+        """
+        Annotates every pending page, `batch_size` pages per spaCy call.
+
+        Parameters:
+            limit: Stop after this many pages.
+
+        Returns:
+            NlpStats: Pages scanned and annotated by this run.
+        """
+        self._nlp_client.load()
+        stats = NlpStats()
+        pending: list[uuid.UUID] = []
+        async for pages in self._data_repo.iter_pages(self._batch_size):
+            stats.scanned += len(pages)
+            pending += await self._pending(pages)
+            if limit is not None:
+                pending = pending[:limit - stats.annotated]
+            while len(pending) >= self._batch_size:
+                await self._annotate(pending[:self._batch_size], stats)
+                pending = pending[self._batch_size:]
+                logger.info(f"{self._tag}|annotate_pending(): {stats}")
+            if limit is not None and stats.annotated + len(pending) >= limit:
+                break
+        if pending:
+            await self._annotate(pending, stats)
+        logger.info(f"{self._tag}|annotate_pending(): Done {stats}")
+        return stats
@@ -0,0 +1,181 @@
+import os
+import socket
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from functools import cached_property
+
+from loguru import logger
+
+from src.core.clients import CacheClient
+from src.core.constants import CRAWL_QUEUE_GROUP, CRAWL_QUEUE_STREAM
+from src.core.types import Action, ModelType, State
+from src.db.models import Task
+from src.repos import TaskRepo
+
+
+class CrawlQueue:
+    """
+    Default crawl queue: polls the `task` table with atomic batch claims.
+    """
+
+    initial_state: State = State.NEW
+
+    def __init__(self, task_repo: TaskRepo, expire_after_s: int) -> None:
+        self._task_repo = task_repo
+        self._expire_after_s = expire_after_s
+
+    @cached_property
+    def _tag(self) -> str:
+        return self.__class__.__name__
+
+    async def claim(
+        self, batch_size: int, ids: list[uuid.UUID] | None = None, job_id: uuid.UUID | None = None
+    ) -> list[Task]:
+        return await self._task_repo.claim_next(
+            batch_size=batch_size,
+            ref_type=ModelType.URL,
+            expire_after_s=self._expire_after_s,
+            ids=ids,
+            job_id=job_id,
+        )
+
+    async def publish(self, task_ids: list[uuid.UUID]) -> None:
+        # New tasks are picked up from the table by the next claim
+        return None
+
+    async def complete(self, task: Task, state: State) -> None:
+        await self._task_repo.transition(
+            [task.id], [State.RUNNING], state, Action.CRAWL, claimed_at=task.updated_at
+        )
+
+    async def release(self, tasks: list[Task]) -> None:
+        # Tasks claimed in the same batch share their claim token
+        by_claim: dict[datetime, list[uuid.UUID]] = defaultdict(list)
+        for task in tasks:
+            by_claim[task.updated_at].append(task.id)
+        for claimed_at, task_ids in by_claim.items():
+            await self._task_repo.transition(task_ids, [State.RUNNING], State.NEW, claimed_at=claimed_at)
+
+    async def flush(self) -> None:
+        return None
+
+
+class StreamCrawlQueue(CrawlQueue):
+    """
+    Crawl queue backed by a redis stream consumer group.
+
+    New tasks are stored as QUEUED and published to the stream, workers read them with
+    XREADGROUP and acknowledge them when done, and entries left pending by a dead
+    consumer are reclaimed with XAUTOCLAIM after `min_idle_ms`. Task states are written
+    back to MariaDB in batches instead of once per claim and completion. The table is
+    still polled every `poll_interval_s` while the stream is empty, which picks up
+    expired tasks and tasks created before the stream was enabled.
+    """
+
+    initial_state: State = State.QUEUED
+
+    def __init__(
+        self,
+        task_repo: TaskRepo,
+        expire_after_s: int,
+        cache_client: CacheClient,
+        min_idle_ms: int = 300_000,
+        flush_size: int = 100,
+        poll_interval_s: float = 30.0,
+        stream: str = CRAWL_QUEUE_STREAM,
+        group: str = CRAWL_QUEUE_GROUP,
+    ) -> None:
+        super().__init__(task_repo, expire_after_s)
+        self._cache_client = cache_client
+        self._min_idle_ms = min_idle_ms
+        self._flush_size = flush_size
+        self._poll_interval_s = poll_interval_s
+        self._stream = stream
+        self._group = group
+        self._consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._group_ready = False
+        self._polled_at = 0.0
+        self._entries: dict[uuid.UUID, str] = {}
+        self._states: dict[uuid.UUID, State] = {}
+
+    async def _ensure_group(self) -> None:
+        if not self._group_ready:
+            await self._cache_client.xgroup_create(self._stream, self._group)
+            self._group_ready = True
+
+    async def _buffer_state(self, task_id: uuid.UUID, state: State) -> None:
+        self._states[task_id] = state
+        if len(self._states) >= self._flush_size:
+            await self.flush()
+
+    async def claim(
+        self, batch_size: int, ids: list[uuid.UUID] | None = None, job_id: uuid.UUID | None = None
+    ) -> list[Task]:
+        if ids or job_id:
+            # Seeds and the tasks of a crawl run are claimed straight from the table; the
+            # stream only carries the untagged frontier
+            return await super().claim(batch_size, ids, job_id)
+
+        await self._ensure_group()
+        entries = await self._cache_client.xautoclaim(
+            self._stream, self._group, self._consumer, self._min_idle_ms, batch_size
+        )
+        if len(entries) < batch_size:
+            entries += await self._cache_client.xreadgroup(
+                self._stream, self._group, self._consumer, batch_size - len(entries)
+            )
+
+        tasks: list[Task] = []
+        if entries:
+            entry_ids = {uuid.UUID(fields["task"]): entry_id for entry_id, fields in entries}
+            tasks = await self._task_repo.all(id__in=list(entry_ids))
+            for task in tasks:
+                self._entries[task.id] = entry_ids.pop(task.id)
+                task.state = State.RUNNING
+                await self._buffer_state(task.id, State.RUNNING)
+            # Whatever is left points at deleted tasks
+            await self._cache_client.xack(self._stream, self._group, list(entry_ids.values()))
+        elif time.monotonic() - self._polled_at >= self._poll_interval_s:
+            self._polled_at = time.monotonic()
+            tasks = await super().claim(batch_size)
+
+        logger.debug(f"{self._tag}|claim(): Claimed {len(tasks)} tasks from {len(entries)} entries")
+        return tasks
+
+    async def publish(self, task_ids: list[uuid.UUID]) -> None:
+        if task_ids:
+            await self._cache_client.xadd(
+                self._stream, [{"task": str(task_id)} for task_id in task_ids]
+            )
+
+    async def complete(self, task: Task, state: State) -> None:
+        entry_id = self._entries.pop(task.id, None)
+        if entry_id:
+            await self._cache_client.xack(self._stream, self._group, [entry_id])
+        await self._buffer_state(task.id, state)
+
+    async def release(self, tasks: list[Task]) -> None:
+        streamed = [task for task in tasks if task.id in self._entries]
+        polled = [task for task in tasks if task.id not in self._entries]
+        if streamed:
+            # Hand the tasks to other consumers right away instead of waiting for reclaim
+            await self.publish([task.id for task in streamed])
+            await self._cache_client.xack(
+                self._stream, self._group, [self._entries.pop(task.id) for task in streamed]
+            )
+            for task in streamed:
+                self._states[task.id] = State.QUEUED
+        await self.flush()
+        await super().release(polled)
+
+    async def flush(self) -> None:
+        states, self._states = self._states, {}
+        by_state: dict[State, list[uuid.UUID]] = defaultdict(list)
+        for task_id, state in states.items():
+            by_state[state].append(task_id)
+        for state, task_ids in by_state.items():
+            await self._task_repo.update_states(task_ids, state, Action.CRAWL)
+        if states:
+            logger.debug(f"{self._tag}|flush(): Wrote {len(states)} task states")
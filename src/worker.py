@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import signal
+
+from loguru import logger
+
+from src.core.clients import (
+    CacheClient,
+    HttpClientFactory,
+    SoupClient,
+    create_extraction_cache,
+    create_parse_executor,
+    create_seen_url_filter,
+)
+from src.core.config import settings
+from src.db import close_db, connect_db
+from src.repos import TaskRepo, UrlRepo, create_data_repo
+from src.services import CrawlJobService, create_crawl_queue, create_crawl_service
+
+
+async def run_worker(workers: int, grace_s: float) -> None:
+    """
+    Runs the crawl loop outside the API process until SIGTERM or SIGINT.
+
+    On a signal the worker stops claiming, finishes the pages in flight for up to
+    `grace_s` seconds and releases every task it still holds back to the frontier.
+
+    Usage:
+        python -m src.worker --workers 8
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    await connect_db()
+    cache_client = CacheClient(cache_url=settings.cache_url)
+    http_client_factory = HttpClientFactory()
+    parse_executor = create_parse_executor()
+    task_repo = TaskRepo()
+    service = create_crawl_service(
+        http_client_factory,
+        SoupClient(),
+        task_repo,
+        UrlRepo(),
+        create_data_repo(),
+        seen_url_filter=create_seen_url_filter(cache_client),
+        crawl_queue=create_crawl_queue(task_repo, cache_client),
+        job_service=CrawlJobService(cache_client),
+        parse_executor=parse_executor,
+        extraction_cache=create_extraction_cache(cache_client),
+    )
+    try:
+        crawl = asyncio.create_task(service.run_worker(stop, workers))
+        stopped = asyncio.create_task(stop.wait())
+        await asyncio.wait({crawl, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        if not crawl.done():
+            logger.info(f"run_worker(): Shutdown requested, draining for up to {grace_s}s")
+        try:
+            await asyncio.wait_for(crawl, timeout=grace_s)
+        except TimeoutError:
+            logger.warning("run_worker(): Grace period over, released unfinished tasks")
+    finally:
+        await http_client_factory.close_all()
+        await parse_executor.close()
+        await cache_client.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a standalone crawl worker")
+    parser.add_argument("--workers", type=int, default=settings.crawl_workers)
+    parser.add_argument("--grace", type=float, default=settings.crawl_worker_grace)
+    args = parser.parse_args()
+
+    asyncio.run(run_worker(args.workers, args.grace))